@@ -6,7 +6,8 @@ phone agents through natural language. Non-technical users describe what
 they need, and the system generates a complete, deployable agent config.
 
 Endpoints:
-  POST /api/create-agent     — Create a new CX agent from natural language
+  POST /api/create-agent     — Create a new CX agent from natural language (NDJSON stream)
+  POST /api/create-agent/sync   — Same, returned as a single JSON body
   GET  /api/health           — Health check
   GET  /api/example          — Returns a pre-built example
   GET  /                     — Serves the web UI
@@ -14,7 +15,7 @@ Endpoints:
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -22,9 +23,16 @@ from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 
+from meta_agent import jsonlib
 from meta_agent.models import (
     AgentCreateRequest,
     AgentCreateResponse,
@@ -44,13 +52,27 @@ logger = logging.getLogger("meta_agent_cx")
 # ── Orchestrator (singleton) ──
 orchestrator: MetaOrchestrator | None = None
 
+# ── /api/example (fixed input, so its output is computed once and reused) ──
+EXAMPLE_REQUEST = AgentCreateRequest(
+    user_prompt=(
+        "Create a support bot for appointment booking. It should greet, "
+        "ask for name and date, and confirm availability via an API."
+    ),
+    language="en-US",
+    platform="voiceowl",
+)
+_example_payload: dict | None = None
+_example_lock = asyncio.Lock()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize the orchestrator on startup."""
-    global orchestrator
+    global orchestrator, _example_payload
     api_key = os.getenv("OPENAI_API_KEY")
-    orchestrator = MetaOrchestrator(openai_api_key=api_key)
+    orchestrator = MetaOrchestrator.get_shared(api_key)
+    _example_payload = None
+    await orchestrator.warmup()
     mode = "LLM-powered (GPT-4o)" if api_key else "Rule-based (no API key)"
     logger.info("╔══════════════════════════════════════════════╗")
     logger.info("║   Meta Agent CX — Ready!                    ║")
@@ -58,6 +80,7 @@ async def lifespan(app: FastAPI):
     logger.info("╚══════════════════════════════════════════════╝")
     yield
     logger.info("Shutting down Meta Agent CX...")
+    await orchestrator.aclose()
 
 
 # ── FastAPI App ──
@@ -69,6 +92,8 @@ app = FastAPI(
     ),
     version="1.0.0",
     lifespan=lifespan,
+    # orjson serializes the large nested agent configs several times faster
+    default_response_class=ORJSONResponse if jsonlib.HAS_ORJSON else JSONResponse,
 )
 
 # ── CORS ──
@@ -104,7 +129,7 @@ async def health_check():
     return HealthResponse()
 
 
-@app.post("/api/create-agent", response_model=AgentCreateResponse)
+@app.post("/api/create-agent")
 async def create_agent(request: AgentCreateRequest):
     """
     Create a new CX phone agent from a natural language description.
@@ -115,6 +140,28 @@ async def create_agent(request: AgentCreateRequest):
     3. Define function calls with API endpoint mappings
     4. Build a conversation flow graph
     5. Return the complete agent configuration
+
+    The response is streamed as NDJSON — one ``{"event", "data"}`` line
+    per section as soon as it is ready, ending with a ``result`` line
+    that holds the full AgentCreateResponse — so clients see the first
+    bytes without waiting for the whole LLM generation. Use
+    /api/create-agent/sync for a single JSON body.
+    """
+    if orchestrator is None:
+        raise HTTPException(status_code=503, detail="Orchestrator not initialized")
+
+    logger.info("Received agent creation request: %s", request.user_prompt[:80])
+    return StreamingResponse(
+        orchestrator.process_request_stream(request),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/api/create-agent/sync", response_model=AgentCreateResponse)
+async def create_agent_sync(request: AgentCreateRequest):
+    """
+    Non-streaming variant of /api/create-agent: waits for the whole
+    pipeline and returns the AgentCreateResponse as one JSON body.
     """
     if orchestrator is None:
         raise HTTPException(status_code=503, detail="Orchestrator not initialized")
@@ -133,31 +180,52 @@ async def get_example():
     """
     Returns a pre-built example showing the full input → output flow.
     Useful for understanding the system without making a real request.
+
+    The input never changes, so the first successful result is kept in
+    memory and served on every later hit.
     """
-    example_request = AgentCreateRequest(
-        user_prompt=(
-            "Create a support bot for appointment booking. It should greet, "
-            "ask for name and date, and confirm availability via an API."
-        ),
-        language="en-US",
-        platform="voiceowl",
-    )
+    global _example_payload
 
     if orchestrator is None:
         raise HTTPException(status_code=503, detail="Orchestrator not initialized")
 
-    result = await orchestrator.process_request(example_request)
-    return {
-        "input": {
-            "user_prompt": example_request.user_prompt,
-            "language": example_request.language,
-            "platform": example_request.platform,
-        },
-        "output": result.model_dump(),
-    }
+    if _example_payload is None:
+        async with _example_lock:
+            # Another request may have filled the cache while we waited
+            if _example_payload is None:
+                result = await orchestrator.process_request(EXAMPLE_REQUEST)
+                payload = {
+                    "input": {
+                        "user_prompt": EXAMPLE_REQUEST.user_prompt,
+                        "language": EXAMPLE_REQUEST.language,
+                        "platform": EXAMPLE_REQUEST.platform,
+                    },
+                    "output": result.model_dump(),
+                }
+                if not result.success:
+                    return payload
+                _example_payload = payload
+
+    return _example_payload
 
 
 # ── Run ──
 if __name__ == "__main__":
+    import importlib.util
+
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+
+    # Auto-reload is for development only and cannot be combined with
+    # multiple workers; set UVICORN_RELOAD=1 to enable it.
+    reload = os.getenv("UVICORN_RELOAD", "").lower() in ("1", "true", "yes")
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        # uvloop and httptools come with uvicorn[standard] (uvloop is not
+        # available on Windows, where we stay on the stdlib event loop)
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        reload=reload,
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", "4")),
+    )
@@ -14,10 +14,18 @@ Function Creator which handles function definitions separately.
 
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
+import hashlib
 import logging
-from typing import Any
-
+import string
+from collections import OrderedDict
+from itertools import chain
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Mapping
+
+from . import jsonlib
+from .llm import completion_timeout, without_retries
 from .models import (
     ConversationFlow,
     CXAgentConfig,
@@ -33,17 +41,148 @@ from .models import (
     VoiceGender,
     VoiceProvider,
 )
-from .prompts import AGENT_CREATOR_PROMPT
+from .prompts import AGENT_CREATOR_BATCH_PROMPT, AGENT_CREATOR_PROMPT
+from .semantic_cache import SemanticCache
+from .streaming import iter_json_members, iter_stream_text
 
 logger = logging.getLogger(__name__)
 
+# ── Static lookup tables (built once at import, read-only) ──
+
+_VOICE_MAP: Mapping[tuple[str, str], str] = MappingProxyType({
+    ("female", "en-US"): "en-US-Neural2-F",
+    ("male", "en-US"): "en-US-Neural2-D",
+    ("neutral", "en-US"): "en-US-Neural2-C",
+    ("female", "en-GB"): "en-GB-Neural2-A",
+    ("male", "en-GB"): "en-GB-Neural2-B",
+    ("female", "hi-IN"): "hi-IN-Neural2-A",
+    ("male", "hi-IN"): "hi-IN-Neural2-B",
+    ("female", "es-ES"): "es-ES-Neural2-A",
+})
+
+_GREETING_TEMPLATES: Mapping[str, str] = MappingProxyType({
+    "warm": (
+        "Hello! Thank you for calling. My name is {name}, and I'm here to help you today. "
+        "How can I assist you?"
+    ),
+    "formal": (
+        "Good day. This is {name}, your {role}. How may I assist you today?"
+    ),
+    "casual": (
+        "Hey there! I'm {name}. What can I help you with today?"
+    ),
+})
+
+# Persona system prompt scaffold, parsed once; only the $-fields vary per agent
+_SYSTEM_PROMPT_TEMPLATE = string.Template(
+    "You are $name, a $traits $role specializing in $domain. "
+    "You handle phone conversations with customers and your primary tasks are:\n"
+    "$task_instructions\n\n"
+    "## Conversation Guidelines\n"
+    "- Always greet the caller warmly and introduce yourself by name.\n"
+    "- Speak clearly and at a moderate pace.\n"
+    "- Confirm information back to the caller before proceeding.\n"
+    "- If you don't understand something, politely ask for clarification.\n"
+    "- If you cannot help with a request, offer to transfer to a human agent.\n"
+    "- Keep responses concise — callers prefer short, clear answers.\n"
+    "- End every call by asking if there's anything else you can help with.\n\n"
+    "## Error Handling\n"
+    "- If an API call fails, apologize and offer to try again or escalate.\n"
+    "- After $max_retries failed attempts to understand, escalate to a human.\n"
+    "- Never make up information — only state what you know or can look up.\n\n"
+    "## Tone\n"
+    "- You are $traits.\n"
+    "- Match the caller's energy level while maintaining professionalism.\n"
+    "- Use the caller's name once you have it to personalize the experience."
+)
+
+# Task-independent nodes appended after the task nodes of every flow.
+# The templates are read-only; each build shallow-copies them with a fresh
+# "transitions" list (the only field _wire_transitions mutates).
+_CLOSING_NODES: tuple[Mapping[str, Any], ...] = (
+    MappingProxyType({
+        "node_id": "node_confirm",
+        "type": "confirm",
+        "label": "Confirm & Anything Else",
+        "prompt_text": "Is there anything else I can help you with today?",
+        "collect_slot": None,
+        "function_call": None,
+    }),
+    MappingProxyType({
+        "node_id": "node_fallback",
+        "type": "fallback",
+        "label": "Fallback / Didn't Understand",
+        "prompt_text": "I'm sorry, I didn't quite catch that. Could you please repeat what you said?",
+        "collect_slot": None,
+        "function_call": None,
+    }),
+    MappingProxyType({
+        "node_id": "node_transfer",
+        "type": "transfer",
+        "label": "Transfer to Human Agent",
+        "prompt_text": (
+            "I appreciate your patience. Let me connect you with a team member "
+            "who can help you further. Please hold for just a moment."
+        ),
+        "collect_slot": None,
+        "function_call": None,
+    }),
+    MappingProxyType({
+        "node_id": "node_end",
+        "type": "end",
+        "label": "End Call",
+        "prompt_text": "Thank you for calling! Have a wonderful day. Goodbye!",
+        "collect_slot": None,
+        "function_call": None,
+    }),
+)
+
+_SLOT_PROMPTS: Mapping[str, str] = MappingProxyType({
+    "name": "Could I please have your name?",
+    "customer_name": "Could I please have your name?",
+    "full_name": "May I have your full name, please?",
+    "first_name": "What's your first name?",
+    "date": "What date works best for you?",
+    "appointment_date": "What date would you like to schedule your appointment?",
+    "preferred_date": "When would you prefer to come in?",
+    "time": "And what time would you prefer?",
+    "appointment_time": "What time would you like your appointment?",
+    "preferred_time": "What time works best for you?",
+    "email": "Could you provide your email address?",
+    "phone": "What's the best phone number to reach you at?",
+    "phone_number": "What's the best phone number to reach you at?",
+    "service": "What type of service are you looking for?",
+    "service_type": "What type of service do you need?",
+    "reason": "Could you tell me the reason for your visit?",
+    "location": "Which location would you prefer?",
+    "order_number": "Could you provide your order number?",
+    "account_number": "What's your account number?",
+    "issue": "Could you describe the issue you're experiencing?",
+    "product": "Which product are you inquiring about?",
+})
+
+# Top-level sections of a generated agent configuration
+_CONFIG_SECTIONS = ("persona", "voice", "intents", "conversation_flow")
+
 
 class AgentCreator:
     """
     Sub-agent that transforms an analysis brief into a structured
     CX agent configuration (persona, voice, intents, conversation flow).
+
+    Micro-batching is opt-in for offline bulk runs: with ``batch_max_size``
+    above 1, briefs that arrive within ``batch_max_wait`` seconds of each
+    other share one chat completion and one copy of the system prompt.
+    Every caller then waits for the whole batch's output, so interactive
+    use keeps the default of one completion per brief.
     """
 
+    # Up to 4 configs of ~4k tokens fit GPT-4o's 16k output limit
+    batch_max_size = 1
+    batch_max_wait = 0.02
+    # Least-recently-used configs beyond this many are evicted
+    cache_max_entries = 256
+
     def __init__(self, llm_client=None):
         """
         Args:
@@ -52,41 +191,290 @@ class AgentCreator:
         """
         self.llm_client = llm_client
         self.system_prompt = AGENT_CREATOR_PROMPT
-
-    async def create_agent_config(self, analysis: dict[str, Any]) -> dict[str, Any]:
+        # LLM responses keyed by a hash of the canonicalized analysis brief
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # Near-duplicate briefs (same structure, reworded text) reuse a
+        # previous LLM config with the new name/role patched in
+        self._semantic_cache = SemanticCache()
+        # Pending (canonical brief, future) pairs drained by the batch worker
+        self._batch_queue: asyncio.Queue | None = None
+        self._batch_loop: asyncio.AbstractEventLoop | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    async def create_agent_config(
+        self,
+        analysis: dict[str, Any],
+        bypass_cache: bool = False,
+    ) -> dict[str, Any]:
         """
         Generate a full agent configuration from the orchestrator's analysis.
 
         If an LLM client is available, uses GPT to generate the config.
         Otherwise, falls back to deterministic rule-based generation.
+
+        Args:
+            analysis: Analysis brief produced by the orchestrator.
+            bypass_cache: If True, always issue a fresh LLM call instead of
+                          returning a cached response for an identical brief.
         """
         if self.llm_client:
-            return await self._create_with_llm(analysis)
-        return self._create_with_rules(analysis)
+            return await self._create_with_llm(analysis, bypass_cache=bypass_cache)
+        # Called inline: the rule builder takes ~60 us, less than the
+        # ~90 us an executor hop would add
+        return self.create_agent_config_with_rules(analysis)
 
-    async def _create_with_llm(self, analysis: dict[str, Any]) -> dict[str, Any]:
+    @staticmethod
+    def _canonical_analysis(analysis: dict[str, Any]) -> str:
+        """Compact, key-sorted JSON of the brief (stable across key order)."""
+        return jsonlib.dumps(analysis, sort_keys=True)
+
+    async def _create_with_llm(
+        self,
+        analysis: dict[str, Any],
+        bypass_cache: bool = False,
+    ) -> dict[str, Any]:
         """Use OpenAI API to generate agent configuration."""
+        canonical = self._canonical_analysis(analysis)
+        key = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        if not bypass_cache and key in self._cache:
+            logger.info("Agent config cache hit (%s)", key[:12])
+            self._cache.move_to_end(key)
+            return copy.deepcopy(self._cache[key])
+        if not bypass_cache:
+            similar = self._semantic_cache.get(analysis)
+            if similar is not None:
+                logger.info("Agent config semantic cache hit")
+                return similar
+
+        try:
+            if self.batch_max_size > 1:
+                config = await self._submit_to_batch(canonical)
+            else:
+                config = await self._complete_single(canonical)
+        except Exception as e:
+            logger.warning("LLM call failed (%s), falling back to rules", e)
+            return self.create_agent_config_with_rules(analysis)
+
+        # Only successful LLM responses are cached; rule fallbacks are cheap
+        self._cache_put(key, config)
+        self._semantic_cache.put(analysis, config)
+        return copy.deepcopy(config)
+
+    async def stream_agent_config(
+        self, analysis: dict[str, Any]
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Yield the agent configuration one top-level section at a time
+        (``persona``, ``voice``, ``intents``, ``conversation_flow``).
+
+        In LLM mode the completion is streamed and each section is yielded
+        as soon as its JSON closes. If the stream fails or leaves a section
+        out, the sections not yet sent are filled in from the rule-based
+        builder. Caching matches ``create_agent_config``: exact and
+        semantic hits are replayed, and only complete LLM configs are stored.
+        """
+        if not self.llm_client:
+            for section in self.create_agent_config_with_rules(analysis).items():
+                yield section
+            return
+
+        canonical = self._canonical_analysis(analysis)
+        key = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            for section in copy.deepcopy(self._cache[key]).items():
+                yield section
+            return
+        similar = self._semantic_cache.get(analysis)
+        if similar is not None:
+            logger.info("Agent config semantic cache hit")
+            for section in similar.items():
+                yield section
+            return
+
+        config: dict[str, Any] = {}
         try:
             response = await self.llm_client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": json.dumps(analysis, indent=2)},
+                    {"role": "user", "content": f"ANALYSIS BRIEF:\n{canonical}"},
                 ],
                 temperature=0.4,
                 max_tokens=4000,
                 response_format={"type": "json_object"},
+                stream=True,
             )
-            raw = response.choices[0].message.content
-            return json.loads(raw)
+            async for name, value in iter_json_members(iter_stream_text(response)):
+                config[name] = value
+                yield name, copy.deepcopy(value)
         except Exception as e:
-            logger.warning("LLM call failed (%s), falling back to rules", e)
-            return self._create_with_rules(analysis)
+            logger.warning("LLM stream failed (%s), falling back to rules", e)
+            for name, value in self.create_agent_config_with_rules(analysis).items():
+                if name not in config:
+                    yield name, value
+            return
+
+        missing = [name for name in _CONFIG_SECTIONS if name not in config]
+        if missing:
+            logger.warning("LLM stream left out %s, filling in from rules", ", ".join(missing))
+            rules_config = self.create_agent_config_with_rules(analysis)
+            for name in missing:
+                yield name, rules_config[name]
+            return
+
+        # Only complete LLM configs are cached, as in _create_with_llm
+        self._cache_put(key, config)
+        self._semantic_cache.put(analysis, config)
+
+    def _cache_put(self, key: str, config: dict[str, Any]) -> None:
+        self._cache[key] = config
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    # ────────────────── LLM Micro-Batching ──────────────────
+
+    async def _submit_to_batch(self, canonical: str) -> dict[str, Any]:
+        """Queue a brief for the batch worker and wait for its config."""
+        loop = asyncio.get_running_loop()
+        if self._batch_queue is None or self._batch_loop is not loop:
+            # (Re)start the worker on the current loop; tests may call
+            # asyncio.run() several times with the same creator
+            self._batch_queue = asyncio.Queue()
+            self._batch_loop = loop
+            self._spawn(self._run_batch_worker(self._batch_queue))
+
+        future: asyncio.Future = loop.create_future()
+        self._batch_queue.put_nowait((canonical, future))
+        return await future
+
+    def _spawn(self, coro) -> None:
+        """Start a background task and keep a reference until it finishes."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch_worker(self, queue: asyncio.Queue) -> None:
+        """Collect briefs for up to ``batch_max_wait`` seconds, then dispatch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.batch_max_wait
+            try:
+                while len(batch) < self.batch_max_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                self._fail_waiters(batch, RuntimeError("Agent Creator was closed"))
+                raise
+            self._spawn(self._dispatch_batch(batch))
+
+    async def _dispatch_batch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """Run one LLM call for the batch and resolve every waiting future."""
+        briefs = [canonical for canonical, _ in batch]
+        try:
+            if len(briefs) == 1:
+                configs = [await self._complete_single(briefs[0])]
+            else:
+                configs = await self._complete_batch(briefs)
+        except asyncio.CancelledError:
+            # Cancelled by aclose(): waiters get an error (and fall back to
+            # rules) instead of hanging on futures nobody will resolve
+            self._fail_waiters(batch, RuntimeError("Agent Creator was closed"))
+            raise
+        except Exception as e:
+            self._fail_waiters(batch, e)
+            return
+
+        for (_, future), config in zip(batch, configs):
+            if not future.done():
+                future.set_result(config)
+
+    @staticmethod
+    def _fail_waiters(batch: list[tuple[str, asyncio.Future]], error: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def aclose(self) -> None:
+        """
+        Stop the batch worker and any in-flight batch calls, failing the
+        briefs still waiting on them. A later request restarts the worker.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = [t for t in self._batch_tasks if t.get_loop() is loop]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        queue, self._batch_queue, self._batch_loop = self._batch_queue, None, None
+        while queue is not None and not queue.empty():
+            self._fail_waiters([queue.get_nowait()], RuntimeError("Agent Creator was closed"))
+
+    async def _complete_single(self, canonical: str) -> dict[str, Any]:
+        """One chat completion for a single brief."""
+        response = await self.llm_client.chat.completions.create(
+            model="gpt-4o",
+            # Static system prompt first and the variable brief last, so
+            # OpenAI's automatic prefix caching can reuse the shared prefix
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": f"ANALYSIS BRIEF:\n{canonical}"},
+            ],
+            temperature=0.4,
+            max_tokens=4000,
+            response_format={"type": "json_object"},
+            timeout=completion_timeout(4000),
+        )
+        raw = response.choices[0].message.content
+        return jsonlib.loads(raw)
+
+    async def _complete_batch(self, briefs: list[str]) -> list[dict[str, Any]]:
+        """
+        One chat completion for several briefs. If the model returns the
+        wrong number of results, retry each brief on its own.
+        """
+        max_tokens = 4000 * len(briefs)
+        # Non-streamed: the timeout covers the whole output, and a failure
+        # is retried per brief below rather than by the SDK
+        response = await without_retries(self.llm_client).chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "system", "content": AGENT_CREATOR_BATCH_PROMPT},
+                {"role": "user", "content": '{"briefs":[' + ",".join(briefs) + "]}"},
+            ],
+            temperature=0.4,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            timeout=completion_timeout(max_tokens),
+        )
+        raw = response.choices[0].message.content
+        results = jsonlib.loads(raw).get("results")
+        if isinstance(results, list) and len(results) == len(briefs):
+            return results
+
+        logger.warning(
+            "Batched LLM call returned %s results for %d briefs, retrying individually",
+            len(results) if isinstance(results, list) else "no",
+            len(briefs),
+        )
+        return list(await asyncio.gather(*(self._complete_single(b) for b in briefs)))
 
     # ────────────────── Rule-Based Fallback ──────────────────
 
-    def _create_with_rules(self, analysis: dict[str, Any]) -> dict[str, Any]:
-        """Deterministic rule-based agent configuration generation."""
+    def create_agent_config_with_rules(self, analysis: dict[str, Any]) -> dict[str, Any]:
+        """
+        Deterministic rule-based agent configuration generation.
+
+        Synchronous and side-effect free (reads ``analysis`` only): the
+        orchestrator's rule-mode fast path calls it directly.
+        """
         persona = self._build_persona(analysis)
         voice = self._build_voice(analysis)
         intents = self._build_intents(analysis)
@@ -105,52 +493,31 @@ class AgentCreator:
         traits = analysis.get("personality_traits", ["friendly", "professional", "helpful"])
         domain = analysis.get("domain", "general")
         greeting_style = analysis.get("greeting_style", "warm")
+        max_retries = 3
 
         # Build the tasks section of the system prompt
         tasks = analysis.get("tasks", [])
-        task_instructions = ""
+        parts: list[str] = []
         for i, task in enumerate(tasks, 1):
-            task_instructions += f"\n{i}. **{task.get('task_name', 'Task')}**: {task.get('description', '')}"
+            parts.append(f"\n{i}. **{task.get('task_name', 'Task')}**: {task.get('description', '')}")
             slots = task.get("data_to_collect", [])
             if slots:
-                task_instructions += f"\n   - Collect: {', '.join(slots)}"
+                parts.append(f"\n   - Collect: {', '.join(slots)}")
             if task.get("requires_api"):
-                task_instructions += f"\n   - API Integration: {task.get('api_description', 'External API call')}"
-
-        system_prompt = (
-            f"You are {name}, a {', '.join(traits)} {role} specializing in {domain}. "
-            f"You handle phone conversations with customers and your primary tasks are:\n"
-            f"{task_instructions}\n\n"
-            f"## Conversation Guidelines\n"
-            f"- Always greet the caller warmly and introduce yourself by name.\n"
-            f"- Speak clearly and at a moderate pace.\n"
-            f"- Confirm information back to the caller before proceeding.\n"
-            f"- If you don't understand something, politely ask for clarification.\n"
-            f"- If you cannot help with a request, offer to transfer to a human agent.\n"
-            f"- Keep responses concise — callers prefer short, clear answers.\n"
-            f"- End every call by asking if there's anything else you can help with.\n\n"
-            f"## Error Handling\n"
-            f"- If an API call fails, apologize and offer to try again or escalate.\n"
-            f"- After {3} failed attempts to understand, escalate to a human.\n"
-            f"- Never make up information — only state what you know or can look up.\n\n"
-            f"## Tone\n"
-            f"- You are {', '.join(traits)}.\n"
-            f"- Match the caller's energy level while maintaining professionalism.\n"
-            f"- Use the caller's name once you have it to personalize the experience."
+                parts.append(f"\n   - API Integration: {task.get('api_description', 'External API call')}")
+        task_instructions = "".join(parts)
+        traits_str = ", ".join(traits)
+
+        system_prompt = _SYSTEM_PROMPT_TEMPLATE.substitute(
+            name=name,
+            traits=traits_str,
+            role=role,
+            domain=domain,
+            task_instructions=task_instructions,
+            max_retries=max_retries,
         )
 
-        greeting_map = {
-            "warm": (
-                f"Hello! Thank you for calling. My name is {name}, and I'm here to help you today. "
-                f"How can I assist you?"
-            ),
-            "formal": (
-                f"Good day. This is {name}, your {role}. How may I assist you today?"
-            ),
-            "casual": (
-                f"Hey there! I'm {name}. What can I help you with today?"
-            ),
-        }
+        greeting_template = _GREETING_TEMPLATES.get(greeting_style, _GREETING_TEMPLATES["warm"])
 
         return {
             "name": name,
@@ -166,26 +533,15 @@ class AgentCreator:
                 "I appreciate your patience. Let me connect you with a team member "
                 "who can help you further. Please hold for just a moment."
             ),
-            "max_retries": 3,
-            "_greeting_text": greeting_map.get(greeting_style, greeting_map["warm"]),
+            "max_retries": max_retries,
+            "_greeting_text": greeting_template.format(name=name, role=role),
         }
 
     def _build_voice(self, analysis: dict[str, Any]) -> dict[str, Any]:
         gender = analysis.get("voice_gender", "female")
         lang = analysis.get("language", "en-US")
 
-        voice_map = {
-            ("female", "en-US"): "en-US-Neural2-F",
-            ("male", "en-US"): "en-US-Neural2-D",
-            ("neutral", "en-US"): "en-US-Neural2-C",
-            ("female", "en-GB"): "en-GB-Neural2-A",
-            ("male", "en-GB"): "en-GB-Neural2-B",
-            ("female", "hi-IN"): "hi-IN-Neural2-A",
-            ("male", "hi-IN"): "hi-IN-Neural2-B",
-            ("female", "es-ES"): "es-ES-Neural2-A",
-        }
-
-        voice_id = voice_map.get((gender, lang), "en-US-Neural2-F")
+        voice_id = _VOICE_MAP.get((gender, lang), "en-US-Neural2-F")
 
         return {
             "provider": "google",
@@ -199,17 +555,21 @@ class AgentCreator:
     def _build_intents(self, analysis: dict[str, Any]) -> list[dict]:
         intents = []
         tasks = analysis.get("tasks", [])
+        lang = analysis.get("language", "en-US")
+
+        def _tp(text: str) -> dict[str, str]:
+            return {"text": text, "language": lang}
 
         # Always include a greeting intent
         intents.append({
             "name": "greeting",
             "description": "Caller greets the agent or starts the conversation",
             "training_phrases": [
-                {"text": "Hello", "language": analysis.get("language", "en-US")},
-                {"text": "Hi there", "language": analysis.get("language", "en-US")},
-                {"text": "Good morning", "language": analysis.get("language", "en-US")},
-                {"text": "Hey", "language": analysis.get("language", "en-US")},
-                {"text": "I need help", "language": analysis.get("language", "en-US")},
+                _tp("Hello"),
+                _tp("Hi there"),
+                _tp("Good morning"),
+                _tp("Hey"),
+                _tp("I need help"),
             ],
             "priority": 5,
         })
@@ -218,14 +578,15 @@ class AgentCreator:
             task_name = task.get("task_name", "unknown").lower().replace(" ", "_")
             intent_name = f"request_{task_name}"
             desc = task.get("description", "")
+            desc_low = desc.lower()
             intents.append({
                 "name": intent_name,
                 "description": f"Caller wants to: {desc}",
                 "training_phrases": [
-                    {"text": f"I want to {desc.lower()}", "language": analysis.get("language", "en-US")},
-                    {"text": f"Can you help me {desc.lower()}", "language": analysis.get("language", "en-US")},
-                    {"text": f"I need to {task_name.replace('_', ' ')}", "language": analysis.get("language", "en-US")},
-                    {"text": f"Please {desc.lower()}", "language": analysis.get("language", "en-US")},
+                    _tp(f"I want to {desc_low}"),
+                    _tp(f"Can you help me {desc_low}"),
+                    _tp(f"I need to {task_name.replace('_', ' ')}"),
+                    _tp(f"Please {desc_low}"),
                 ],
                 "priority": 3,
             })
@@ -243,10 +604,10 @@ class AgentCreator:
             "name": "request_human_agent",
             "description": "Caller wants to speak with a human",
             "training_phrases": [
-                {"text": "I want to talk to a person", "language": analysis.get("language", "en-US")},
-                {"text": "Transfer me to a human", "language": analysis.get("language", "en-US")},
-                {"text": "Can I speak with someone", "language": analysis.get("language", "en-US")},
-                {"text": "Let me talk to a real person", "language": analysis.get("language", "en-US")},
+                _tp("I want to talk to a person"),
+                _tp("Transfer me to a human"),
+                _tp("Can I speak with someone"),
+                _tp("Let me talk to a real person"),
             ],
             "priority": 8,
         })
@@ -255,18 +616,21 @@ class AgentCreator:
 
     def _build_flow(self, analysis: dict[str, Any]) -> dict[str, Any]:
         """Build a conversation flow graph from the analysis."""
-        nodes: list[dict] = []
         tasks = analysis.get("tasks", [])
         functions_needed = analysis.get("functions_needed", [])
-        func_names = {f["name"] for f in functions_needed}
+        agent_name = analysis.get("agent_name_suggestion", "Ava")
+        # Function names in declaration order; the first one is the default
+        # target for API nodes that match nothing more specific
+        fn_names = [f["name"] for f in functions_needed]
+        default_fn = fn_names[0] if fn_names else None
 
         # 1. Greeting node
         persona_greeting = (
             f"Hello! Thank you for calling. My name is "
-            f"{analysis.get('agent_name_suggestion', 'Ava')}, and I'm here to help you today. "
+            f"{agent_name}, and I'm here to help you today. "
             f"How can I assist you?"
         )
-        nodes.append({
+        greeting_node = {
             "node_id": "node_greet",
             "type": "greeting",
             "label": "Welcome Greeting",
@@ -274,156 +638,109 @@ class AgentCreator:
             "collect_slot": None,
             "function_call": None,
             "transitions": [],
-        })
+        }
 
-        prev_node_id = "node_greet"
+        # 2. Per-task collect / API / decision / response nodes,
+        # 3. then confirm, fallback, transfer and end
+        nodes: list[dict] = [
+            greeting_node,
+            *chain.from_iterable(
+                self._task_nodes(task, agent_name, fn_names, default_fn) for task in tasks
+            ),
+            *({**template, "transitions": []} for template in _CLOSING_NODES),
+        ]
 
-        # 2. For each task, create collect nodes + API call + response
-        for task in tasks:
-            task_name = task.get("task_name", "task").lower().replace(" ", "_")
-            slots = task.get("data_to_collect", [])
+        # ── Wire transitions ──
+        self._wire_transitions(nodes, tasks, functions_needed)
 
-            # Link previous node to first collect node or API node
-            first_task_node_id = None
-
-            # Collect slots
-            for slot in slots:
-                slot_id = slot.lower().replace(" ", "_")
-                node_id = f"node_collect_{slot_id}"
-                if first_task_node_id is None:
-                    first_task_node_id = node_id
-
-                prompt = self._slot_prompt(slot, analysis.get("agent_name_suggestion", "Ava"))
-                nodes.append({
-                    "node_id": node_id,
-                    "type": "collect_info",
-                    "label": f"Collect {slot.replace('_', ' ').title()}",
-                    "prompt_text": prompt,
-                    "collect_slot": slot_id,
-                    "function_call": None,
-                    "transitions": [],
-                })
+        return {
+            "name": f"{analysis.get('domain', 'general')}_flow",
+            "description": (
+                f"Conversation flow for {analysis.get('agent_name_suggestion', 'the agent')} "
+                f"handling {', '.join(t.get('task_name', '') for t in tasks)}"
+            ),
+            "entry_node_id": "node_greet",
+            "nodes": nodes,
+        }
 
-            # API call node (if task requires it)
-            if task.get("requires_api"):
-                matching_fn = None
-                for fn in functions_needed:
-                    if task_name in fn["name"] or fn["name"] in str(task.get("api_description", "")):
-                        matching_fn = fn["name"]
-                        break
-                if matching_fn is None and functions_needed:
-                    matching_fn = functions_needed[0]["name"]
+    def _task_nodes(
+        self,
+        task: dict[str, Any],
+        agent_name: str,
+        fn_names: list[str],
+        default_fn: str | None,
+    ) -> list[dict]:
+        """Flow nodes for one task: a collect node per slot, plus API nodes."""
+        task_name = task.get("task_name", "task").lower().replace(" ", "_")
+
+        nodes = [
+            {
+                "node_id": f"node_collect_{slot_id}",
+                "type": "collect_info",
+                "label": f"Collect {slot.replace('_', ' ').title()}",
+                "prompt_text": self._slot_prompt(slot, agent_name),
+                "collect_slot": slot_id,
+                "function_call": None,
+                "transitions": [],
+            }
+            for slot in task.get("data_to_collect", [])
+            for slot_id in (slot.lower().replace(" ", "_"),)
+        ]
+
+        # API call node (if task requires it) + decision and outcome nodes
+        if task.get("requires_api"):
+            api_desc = str(task.get("api_description", ""))
+            matching_fn = next(
+                (fn for fn in fn_names if task_name in fn or fn in api_desc),
+                default_fn,
+            )
+            readable = task_name.replace("_", " ")
+            title = readable.title()
 
-                api_node_id = f"node_api_{task_name}"
-                nodes.append({
-                    "node_id": api_node_id,
+            nodes += [
+                {
+                    "node_id": f"node_api_{task_name}",
                     "type": "api_call",
-                    "label": f"Call API for {task_name.replace('_', ' ').title()}",
+                    "label": f"Call API for {title}",
                     "prompt_text": "One moment while I look that up for you...",
                     "collect_slot": None,
                     "function_call": matching_fn,
                     "transitions": [],
-                })
-
-                # Decision node after API
-                decision_node_id = f"node_decision_{task_name}"
-                nodes.append({
-                    "node_id": decision_node_id,
+                },
+                {
+                    "node_id": f"node_decision_{task_name}",
                     "type": "decision",
-                    "label": f"Check {task_name.replace('_', ' ').title()} Result",
+                    "label": f"Check {title} Result",
                     "prompt_text": None,
                     "collect_slot": None,
                     "function_call": None,
                     "transitions": [],
-                })
-
-                # Success response
-                success_node_id = f"node_success_{task_name}"
-                nodes.append({
-                    "node_id": success_node_id,
+                },
+                {
+                    "node_id": f"node_success_{task_name}",
                     "type": "response",
-                    "label": f"{task_name.replace('_', ' ').title()} — Success",
-                    "prompt_text": f"Great news! I've processed your {task_name.replace('_', ' ')} successfully.",
+                    "label": f"{title} — Success",
+                    "prompt_text": f"Great news! I've processed your {readable} successfully.",
                     "collect_slot": None,
                     "function_call": None,
                     "transitions": [],
-                })
-
-                # Failure response
-                failure_node_id = f"node_failure_{task_name}"
-                nodes.append({
-                    "node_id": failure_node_id,
+                },
+                {
+                    "node_id": f"node_failure_{task_name}",
                     "type": "response",
-                    "label": f"{task_name.replace('_', ' ').title()} — Failure",
+                    "label": f"{title} — Failure",
                     "prompt_text": (
                         f"I'm sorry, I wasn't able to complete your "
-                        f"{task_name.replace('_', ' ')} at this time. "
+                        f"{readable} at this time. "
                         f"Would you like me to transfer you to a team member?"
                     ),
                     "collect_slot": None,
                     "function_call": None,
                     "transitions": [],
-                })
-
-        # Confirm node
-        nodes.append({
-            "node_id": "node_confirm",
-            "type": "confirm",
-            "label": "Confirm & Anything Else",
-            "prompt_text": "Is there anything else I can help you with today?",
-            "collect_slot": None,
-            "function_call": None,
-            "transitions": [],
-        })
-
-        # Fallback node
-        nodes.append({
-            "node_id": "node_fallback",
-            "type": "fallback",
-            "label": "Fallback / Didn't Understand",
-            "prompt_text": "I'm sorry, I didn't quite catch that. Could you please repeat what you said?",
-            "collect_slot": None,
-            "function_call": None,
-            "transitions": [],
-        })
-
-        # Transfer node
-        nodes.append({
-            "node_id": "node_transfer",
-            "type": "transfer",
-            "label": "Transfer to Human Agent",
-            "prompt_text": (
-                "I appreciate your patience. Let me connect you with a team member "
-                "who can help you further. Please hold for just a moment."
-            ),
-            "collect_slot": None,
-            "function_call": None,
-            "transitions": [],
-        })
-
-        # End node
-        nodes.append({
-            "node_id": "node_end",
-            "type": "end",
-            "label": "End Call",
-            "prompt_text": "Thank you for calling! Have a wonderful day. Goodbye!",
-            "collect_slot": None,
-            "function_call": None,
-            "transitions": [],
-        })
+                },
+            ]
 
-        # ── Wire transitions ──
-        self._wire_transitions(nodes, tasks, functions_needed)
-
-        return {
-            "name": f"{analysis.get('domain', 'general')}_flow",
-            "description": (
-                f"Conversation flow for {analysis.get('agent_name_suggestion', 'the agent')} "
-                f"handling {', '.join(t.get('task_name', '') for t in tasks)}"
-            ),
-            "entry_node_id": "node_greet",
-            "nodes": nodes,
-        }
+        return nodes
 
     def _wire_transitions(
         self,
@@ -431,133 +748,84 @@ class AgentCreator:
         tasks: list[dict],
         functions_needed: list[dict],
     ) -> None:
-        """Wire up transitions between flow nodes."""
+        """
+        Wire up transitions between flow nodes.
+
+        Every ID looked up here is generated from the same tasks by
+        ``_build_flow``, so the nodes are known to exist.
+        """
         node_map = {n["node_id"]: n for n in nodes}
 
-        # Find ordered task-related node groups
-        task_groups: list[list[str]] = []
+        # Find ordered task-related node groups, keyed by normalized task name
+        task_groups: list[tuple[str, list[str]]] = []
         for task in tasks:
             task_name = task.get("task_name", "task").lower().replace(" ", "_")
-            slots = task.get("data_to_collect", [])
-            group_ids: list[str] = []
-
-            for slot in slots:
-                nid = f"node_collect_{slot.lower().replace(' ', '_')}"
-                if nid in node_map:
-                    group_ids.append(nid)
-
+            group_ids = [
+                f"node_collect_{slot.lower().replace(' ', '_')}"
+                for slot in task.get("data_to_collect", [])
+            ]
             if task.get("requires_api"):
-                api_nid = f"node_api_{task_name}"
-                if api_nid in node_map:
-                    group_ids.append(api_nid)
-                dec_nid = f"node_decision_{task_name}"
-                if dec_nid in node_map:
-                    group_ids.append(dec_nid)
-
-            task_groups.append(group_ids)
+                group_ids.append(f"node_api_{task_name}")
+                group_ids.append(f"node_decision_{task_name}")
+            task_groups.append((task_name, group_ids))
 
         # Greeting → first task node
-        if task_groups and task_groups[0]:
-            node_map["node_greet"]["transitions"].append(
-                {"condition": "user_responds", "target_node_id": task_groups[0][0]}
-            )
-        else:
-            node_map["node_greet"]["transitions"].append(
-                {"condition": "user_responds", "target_node_id": "node_confirm"}
-            )
+        first_target = task_groups[0][1][0] if task_groups and task_groups[0][1] else "node_confirm"
+        node_map["node_greet"]["transitions"].append(
+            {"condition": "user_responds", "target_node_id": first_target}
+        )
 
         # Chain nodes within each task group
-        for group in task_groups:
+        for task_name, group in task_groups:
             for i, nid in enumerate(group):
-                next_nid = group[i + 1] if i + 1 < len(group) else None
+                next_nid = group[i + 1] if i + 1 < len(group) else "node_confirm"
                 node = node_map[nid]
 
                 if node["type"] == "collect_info":
-                    if next_nid:
-                        node["transitions"].append(
-                            {"condition": "slot_filled", "target_node_id": next_nid}
-                        )
-                    else:
-                        node["transitions"].append(
-                            {"condition": "slot_filled", "target_node_id": "node_confirm"}
-                        )
+                    node["transitions"].append(
+                        {"condition": "slot_filled", "target_node_id": next_nid}
+                    )
                 elif node["type"] == "api_call":
-                    if next_nid:
-                        node["transitions"].append(
-                            {"condition": "api_response_received", "target_node_id": next_nid}
-                        )
-                    else:
-                        node["transitions"].append(
-                            {"condition": "api_response_received", "target_node_id": "node_confirm"}
-                        )
+                    node["transitions"].append(
+                        {"condition": "api_response_received", "target_node_id": next_nid}
+                    )
                 elif node["type"] == "decision":
-                    task_name = nid.replace("node_decision_", "")
                     success_nid = f"node_success_{task_name}"
                     failure_nid = f"node_failure_{task_name}"
-                    if success_nid in node_map:
-                        node["transitions"].append(
-                            {"condition": "success", "target_node_id": success_nid}
-                        )
-                        node_map[success_nid]["transitions"].append(
-                            {"condition": "continue", "target_node_id": "node_confirm"}
-                        )
-                    if failure_nid in node_map:
-                        node["transitions"].append(
-                            {"condition": "failure", "target_node_id": failure_nid}
-                        )
-                        node_map[failure_nid]["transitions"].append(
-                            {"condition": "user_wants_transfer", "target_node_id": "node_transfer"}
-                        )
-                        node_map[failure_nid]["transitions"].append(
-                            {"condition": "user_declines_transfer", "target_node_id": "node_confirm"}
-                        )
+                    node["transitions"].append(
+                        {"condition": "success", "target_node_id": success_nid}
+                    )
+                    node_map[success_nid]["transitions"].append(
+                        {"condition": "continue", "target_node_id": "node_confirm"}
+                    )
+                    node["transitions"].append(
+                        {"condition": "failure", "target_node_id": failure_nid}
+                    )
+                    node_map[failure_nid]["transitions"].extend([
+                        {"condition": "user_wants_transfer", "target_node_id": "node_transfer"},
+                        {"condition": "user_declines_transfer", "target_node_id": "node_confirm"},
+                    ])
 
         # Confirm → end or back to greeting
-        if "node_confirm" in node_map:
-            node_map["node_confirm"]["transitions"].extend([
-                {"condition": "nothing_else", "target_node_id": "node_end"},
-                {"condition": "has_more_questions", "target_node_id": "node_greet"},
-            ])
+        node_map["node_confirm"]["transitions"].extend([
+            {"condition": "nothing_else", "target_node_id": "node_end"},
+            {"condition": "has_more_questions", "target_node_id": "node_greet"},
+        ])
 
         # Fallback → back to previous context (greet for simplicity)
-        if "node_fallback" in node_map:
-            node_map["node_fallback"]["transitions"].append(
-                {"condition": "retry", "target_node_id": "node_greet"}
-            )
+        node_map["node_fallback"]["transitions"].append(
+            {"condition": "retry", "target_node_id": "node_greet"}
+        )
 
         # Transfer → end
-        if "node_transfer" in node_map:
-            node_map["node_transfer"]["transitions"].append(
-                {"condition": "transferred", "target_node_id": "node_end"}
-            )
+        node_map["node_transfer"]["transitions"].append(
+            {"condition": "transferred", "target_node_id": "node_end"}
+        )
 
     def _slot_prompt(self, slot: str, agent_name: str) -> str:
         """Generate a natural prompt for collecting a slot value."""
-        slot_prompts = {
-            "name": "Could I please have your name?",
-            "customer_name": "Could I please have your name?",
-            "full_name": "May I have your full name, please?",
-            "first_name": "What's your first name?",
-            "date": "What date works best for you?",
-            "appointment_date": "What date would you like to schedule your appointment?",
-            "preferred_date": "When would you prefer to come in?",
-            "time": "And what time would you prefer?",
-            "appointment_time": "What time would you like your appointment?",
-            "preferred_time": "What time works best for you?",
-            "email": "Could you provide your email address?",
-            "phone": "What's the best phone number to reach you at?",
-            "phone_number": "What's the best phone number to reach you at?",
-            "service": "What type of service are you looking for?",
-            "service_type": "What type of service do you need?",
-            "reason": "Could you tell me the reason for your visit?",
-            "location": "Which location would you prefer?",
-            "order_number": "Could you provide your order number?",
-            "account_number": "What's your account number?",
-            "issue": "Could you describe the issue you're experiencing?",
-            "product": "Which product are you inquiring about?",
-        }
-        readable = slot.replace("_", " ")
-        return slot_prompts.get(
-            slot.lower(),
-            f"Could you please provide your {readable}?"
-        )
+        prompt = _SLOT_PROMPTS.get(slot.lower())
+        if prompt is not None:
+            return prompt
+        # Only build the generic prompt on a miss
+        return f"Could you please provide your {slot.replace('_', ' ')}?"
@@ -15,10 +15,16 @@ merges their outputs into a single CXAgentConfig.
 
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
+import hashlib
 import logging
-from typing import Any
+import re
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Mapping
 
+from . import jsonlib
 from .models import (
     APIEndpoint,
     FunctionDefinition,
@@ -27,19 +33,276 @@ from .models import (
     ParamType,
 )
 from .prompts import FUNCTION_CREATOR_PROMPT
+from .streaming import iter_json_array_items, iter_stream_text
 
 logger = logging.getLogger(__name__)
 
+# Name keywords → HTTP method. Insertion order is priority order: the first
+# method with any keyword inside the function name wins.
+_VERB_TO_METHOD: dict[str, str] = {
+    "get": "GET", "fetch": "GET", "list": "GET", "check": "GET",
+    "search": "GET", "find": "GET", "lookup": "GET",
+    "create": "POST", "book": "POST", "schedule": "POST", "submit": "POST",
+    "register": "POST",
+    "update": "PUT", "modify": "PUT", "change": "PUT",
+    "delete": "DELETE", "cancel": "DELETE", "remove": "DELETE",
+}
+# One alternation per method, so a name is scanned at most four times in C.
+# Substring (not token) matching keeps e.g. process_cancellation → DELETE.
+_METHOD_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = tuple(
+    (re.compile("|".join(kw for kw, m in _VERB_TO_METHOD.items() if m == method)), method)
+    for method in dict.fromkeys(_VERB_TO_METHOD.values())
+)
+_PURPOSE_HINTS = re.compile("retrieve|query|look up")
+# Verb tokens dropped from a function name to form its resource path
+_URL_VERBS = frozenset({
+    "get", "fetch", "create", "book", "update", "delete", "check", "list",
+    "search", "submit", "cancel",
+})
+_URL_PREFIX = "/api/v1/"
+
+# Structured-output schema for the LLM response. Strict mode guarantees the
+# reply parses and has every field, so a malformed body can no longer push
+# a whole chunk onto the rule fallback. Strict schemas can't express
+# free-form objects, so the mock response comes back JSON-encoded.
+_RESPONSE_FORMAT: dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "function_definitions",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "additionalProperties": False,
+            "required": ["functions"],
+            "properties": {
+                "functions": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "additionalProperties": False,
+                        "required": [
+                            "name", "description", "parameters", "returns_description",
+                            "api_endpoint", "mock_response",
+                        ],
+                        "properties": {
+                            "name": {"type": "string"},
+                            "description": {"type": "string"},
+                            "parameters": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "additionalProperties": False,
+                                    "required": ["name", "type", "description", "required", "default", "enum"],
+                                    "properties": {
+                                        "name": {"type": "string"},
+                                        "type": {"type": "string", "enum": [t.value for t in ParamType]},
+                                        "description": {"type": "string"},
+                                        "required": {"type": "boolean"},
+                                        "default": {"type": ["string", "number", "boolean", "null"]},
+                                        "enum": {"type": ["array", "null"], "items": {"type": "string"}},
+                                    },
+                                },
+                            },
+                            "returns_description": {"type": "string"},
+                            "api_endpoint": {
+                                "type": "object",
+                                "additionalProperties": False,
+                                "required": ["url", "method", "headers", "auth_type", "timeout_seconds"],
+                                "properties": {
+                                    "url": {"type": "string"},
+                                    "method": {"type": "string", "enum": [m.value for m in HTTPMethod]},
+                                    "headers": {
+                                        "type": "object",
+                                        "additionalProperties": False,
+                                        "required": ["Content-Type"],
+                                        "properties": {"Content-Type": {"type": "string"}},
+                                    },
+                                    "auth_type": {"type": "string", "enum": ["none", "api_key", "bearer", "oauth2"]},
+                                    "timeout_seconds": {"type": "integer"},
+                                },
+                            },
+                            "mock_response": {
+                                "type": "string",
+                                "description": "The realistic mock JSON response, serialized as a JSON string",
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of a JSON-like value: dicts → MappingProxyType, lists → tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Mutable deep copy of a (possibly frozen) JSON-like value."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(v) for v in value]
+    return value
+
+
+# Domain-specific mock responses, keyed by a keyword in the function name.
+# Insertion order is priority order when a name mentions several keywords.
+# Deep-frozen and shared; _build_function thaws a copy into each definition.
+_MOCK_TEMPLATES: Mapping[str, Mapping[str, Any]] = _freeze({
+    "appointment": {
+        "success": True,
+        "data": {
+            "available_slots": [
+                {"date": "2026-02-24", "time": "09:00 AM", "available": True},
+                {"date": "2026-02-24", "time": "10:30 AM", "available": True},
+                {"date": "2026-02-24", "time": "02:00 PM", "available": True},
+            ],
+            "timezone": "America/New_York",
+        },
+        "message": "Available slots retrieved successfully",
+    },
+    "book": {
+        "success": True,
+        "data": {
+            "booking_id": "BK-20260224-001",
+            "status": "confirmed",
+            "confirmation_code": "CONF-7829",
+            "date": "2026-02-24",
+            "time": "10:30 AM",
+        },
+        "message": "Appointment booked successfully",
+    },
+    "order": {
+        "success": True,
+        "data": {
+            "order_id": "ORD-2026-4521",
+            "status": "shipped",
+            "tracking_number": "1Z999AA10123456784",
+            "estimated_delivery": "2026-02-26",
+            "items": [
+                {"name": "Product A", "quantity": 1, "price": 29.99}
+            ],
+        },
+        "message": "Order details retrieved successfully",
+    },
+    "account": {
+        "success": True,
+        "data": {
+            "account_id": "ACC-78291",
+            "name": "John Smith",
+            "status": "active",
+            "balance": 1250.00,
+            "last_activity": "2026-02-23",
+        },
+        "message": "Account information retrieved successfully",
+    },
+    "cancel": {
+        "success": True,
+        "data": {
+            "cancellation_id": "CAN-20260224-003",
+            "status": "cancelled",
+            "refund_amount": 29.99,
+            "refund_eta": "3-5 business days",
+        },
+        "message": "Cancellation processed successfully",
+    },
+    "transfer": {
+        "success": True,
+        "data": {
+            "transfer_id": "TRF-001",
+            "department": "Customer Support",
+            "estimated_wait": "2 minutes",
+            "queue_position": 3,
+        },
+        "message": "Transfer initiated",
+    },
+    "verify": {
+        "success": True,
+        "data": {
+            "verified": True,
+            "customer_id": "CUST-45678",
+            "name": "John Smith",
+        },
+        "message": "Customer verified successfully",
+    },
+})
+_MOCK_PRIORITY = {kw: i for i, kw in enumerate(_MOCK_TEMPLATES)}
+# Zero-width lookahead so overlapping keywords are all reported in one scan
+_MOCK_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _MOCK_TEMPLATES)) + "))")
+
+
+def _match_mock_keyword(name_lower: str) -> str | None:
+    """Highest-priority mock template keyword contained in the name."""
+    found = {m.group(1) for m in _MOCK_KEYWORD_RE.finditer(name_lower)}
+    return min(found, key=_MOCK_PRIORITY.__getitem__) if found else None
+
+
+def _tool_parameters(parameters: list[dict[str, Any]]) -> dict[str, Any]:
+    """JSON-schema ``parameters`` object for one function's parameter list."""
+    properties: dict[str, Any] = {}
+    required: list[str] = []
+    for p in parameters:
+        name = p["name"]
+        prop: dict[str, Any] = {
+            "type": p.get("type", "string"),
+            "description": p.get("description", ""),
+        }
+        enum = p.get("enum")
+        if enum:
+            prop["enum"] = enum
+        default = p.get("default")
+        if default is not None:
+            prop["default"] = default
+        properties[name] = prop
+        if p.get("required", True):
+            required.append(name)
+    return {"type": "object", "properties": properties, "required": required}
+
 
 class FunctionCreator:
     """
     Sub-agent that generates callable function definitions from
     the orchestrator's analysis brief.
+
+    In LLM mode, requirements are sent in chunks of ``llm_chunk_size``,
+    one chat completion per chunk, so a long requirements list doesn't
+    overflow a single response's token budget. Chunks are requested
+    concurrently, at most ``max_concurrency`` at a time.
     """
 
-    def __init__(self, llm_client=None):
+    # ~375 output tokens per definition fits the 3000-token response budget
+    llm_chunk_size = 8
+    # Retries for rate-limited (HTTP 429) calls, with exponential backoff
+    rate_limit_retries = 3
+    rate_limit_backoff = 1.0
+    # Least-recently-used results beyond this many are evicted
+    cache_max_entries = 512
+
+    def __init__(self, llm_client=None, max_concurrency: int = 8):
+        """
+        Args:
+            llm_client: Optional OpenAI client. If None, uses built-in
+                        rule-based generation (no external API needed).
+            max_concurrency: Upper bound on in-flight LLM calls, shared by
+                             all requests using this creator.
+        """
         self.llm_client = llm_client
+        # Static and always sent first: keeping it byte-identical lets the
+        # provider's automatic prefix cache reuse it across calls.
         self.system_prompt = FUNCTION_CREATOR_PROMPT
+        self.max_concurrency = max_concurrency
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+        # Generated definitions keyed by a hash of the canonicalized requirements
+        self._cache: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
 
     async def create_functions(
         self,
@@ -58,45 +321,218 @@ class FunctionCreator:
         if not functions_needed:
             return []
 
+        key = self._cache_key(functions_needed)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return copy.deepcopy(self._cache[key])
+
         if self.llm_client:
-            return await self._create_with_llm(functions_needed)
-        return self._create_with_rules(functions_needed)
+            functions, from_llm = await self._create_with_llm(functions_needed)
+        else:
+            functions, from_llm = self.create_functions_with_rules(functions_needed), True
+
+        # Rule fallbacks for a failed LLM call aren't cached: the next
+        # request for these requirements tries the LLM again
+        if from_llm:
+            self._cache_put(key, functions)
+        return copy.deepcopy(functions)
+
+    async def create_functions_stream(
+        self,
+        functions_needed: list[dict[str, Any]],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Like ``create_functions``, but yield each definition as soon as it
+        is ready.
+
+        In LLM mode each chunk's completion is streamed and a function is
+        yielded the moment its JSON object closes. Chunks are streamed one
+        after another, so definitions come out in requirement order.
+        """
+        if not functions_needed:
+            return
+
+        key = self._cache_key(functions_needed)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            for fn in copy.deepcopy(self._cache[key]):
+                yield fn
+            return
+
+        functions: list[dict[str, Any]] = []
+        all_from_llm = True
+        if self.llm_client:
+            size = self.llm_chunk_size
+            for start in range(0, len(functions_needed), size):
+                async for fn, from_llm in self._stream_chunk(functions_needed[start:start + size]):
+                    all_from_llm = all_from_llm and from_llm
+                    functions.append(fn)
+                    yield copy.deepcopy(fn)
+        else:
+            for fn in self.create_functions_with_rules(functions_needed):
+                functions.append(fn)
+                yield copy.deepcopy(fn)
+
+        if all_from_llm:
+            self._cache_put(key, functions)
+
+    def clear_cache(self) -> None:
+        """Drop all cached function definitions."""
+        self._cache.clear()
+
+    @staticmethod
+    def _cache_key(functions_needed: list[dict[str, Any]]) -> str:
+        return hashlib.sha256(
+            jsonlib.dumps(functions_needed, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _cache_put(self, key: str, functions: list[dict[str, Any]]) -> None:
+        self._cache[key] = functions
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
 
     # ────────────────── LLM-Powered Generation ──────────────────
 
     async def _create_with_llm(
         self, functions_needed: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
-        """Use OpenAI API to generate function definitions."""
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Use OpenAI API to generate function definitions, one call per chunk.
+        Also returns whether every definition came from the LLM.
+        """
+        size = self.llm_chunk_size
+        chunks = [functions_needed[i:i + size] for i in range(0, len(functions_needed), size)]
+        results = await asyncio.gather(*(self._create_chunk(chunk) for chunk in chunks))
+        functions = [fn for chunk_functions, _ in results for fn in chunk_functions]
+        return functions, all(from_llm for _, from_llm in results)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limiter for LLM calls, bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _complete(self, **kwargs: Any) -> Any:
+        """
+        ``chat.completions.create`` under the concurrency limit, retrying
+        HTTP 429 responses with exponential backoff.
+        """
+        async with self._get_semaphore():
+            for attempt in range(self.rate_limit_retries + 1):
+                try:
+                    return await self.llm_client.chat.completions.create(**kwargs)
+                except Exception as e:
+                    if getattr(e, "status_code", None) != 429 or attempt == self.rate_limit_retries:
+                        raise
+                    delay = self.rate_limit_backoff * 2 ** attempt
+                    logger.info("Rate limited, retrying in %.1fs", delay)
+                    await asyncio.sleep(delay)
+
+    @staticmethod
+    def _log_cache_usage(response: Any) -> None:
+        """Log how many prompt tokens the provider served from its prefix cache."""
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        if cached is not None:
+            logger.debug("Prompt cache: %s of %s prompt tokens cached", cached, usage.prompt_tokens)
+
+    @staticmethod
+    def _decode_mock(mock: Any) -> Any:
+        """Turn the schema's JSON-string mock response back into an object."""
+        if not isinstance(mock, str):
+            return mock
+        try:
+            decoded = jsonlib.loads(mock)
+        except ValueError:
+            return {"raw": mock}
+        return decoded if isinstance(decoded, dict) else {"data": decoded}
+
+    async def _create_chunk(
+        self, chunk: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Generate definitions for one chunk of requirements in a single call.
+        Requirements the model skipped are filled in by the rule builder;
+        the flag is False when any definition came from it.
+        """
         try:
-            response = await self.llm_client.chat.completions.create(
+            response = await self._complete(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": json.dumps(functions_needed, indent=2)},
+                    {"role": "user", "content": jsonlib.dumps(chunk)},
                 ],
                 temperature=0.3,
                 max_tokens=3000,
-                response_format={"type": "json_object"},
+                response_format=_RESPONSE_FORMAT,
             )
+            self._log_cache_usage(response)
             raw = response.choices[0].message.content
-            result = json.loads(raw)
-            return result.get("functions", [])
+            # Schema-conformant by construction: no further validation here
+            functions = jsonlib.loads(raw)["functions"]
         except Exception as e:
             logger.warning("LLM call failed (%s), falling back to rules", e)
-            return self._create_with_rules(functions_needed)
+            return self.create_functions_with_rules(chunk), False
+
+        for fn in functions:
+            fn["mock_response"] = self._decode_mock(fn.get("mock_response"))
+
+        returned = {fn.get("name") for fn in functions}
+        missing = [req for req in chunk if req.get("name") not in returned]
+        if missing:
+            logger.warning(
+                "LLM skipped %d of %d functions, building them with rules",
+                len(missing), len(chunk),
+            )
+            functions.extend(self.create_functions_with_rules(missing))
+        return functions, not missing
+
+    async def _stream_chunk(
+        self, chunk: list[dict[str, Any]]
+    ) -> AsyncIterator[tuple[dict[str, Any], bool]]:
+        """
+        Streaming counterpart of ``_create_chunk``, yielding
+        ``(definition, from_llm)``. If the stream fails, or the model skips
+        requirements, the rest come from the rule builder.
+        """
+        returned: set[str] = set()
+        try:
+            response = await self._complete(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": jsonlib.dumps(chunk)},
+                ],
+                temperature=0.3,
+                max_tokens=3000,
+                response_format=_RESPONSE_FORMAT,
+                stream=True,
+            )
+            async for fn in iter_json_array_items(iter_stream_text(response)):
+                fn["mock_response"] = self._decode_mock(fn.get("mock_response"))
+                returned.add(fn.get("name"))
+                yield fn, True
+        except Exception as e:
+            logger.warning("LLM stream failed (%s), falling back to rules", e)
+
+        missing = [req for req in chunk if req.get("name") not in returned]
+        if missing:
+            for fn in self.create_functions_with_rules(missing):
+                yield fn, False
 
     # ────────────────── Rule-Based Fallback ──────────────────
 
-    def _create_with_rules(
+    def create_functions_with_rules(
         self, functions_needed: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
-        """Deterministic rule-based function definition generation."""
-        functions = []
-        for fn_req in functions_needed:
-            fn_def = self._build_function(fn_req)
-            functions.append(fn_def)
-        return functions
+        """
+        Deterministic rule-based function definition generation.
+        Synchronous and uncached; ``create_functions`` wraps it with the cache.
+        """
+        return [self._build_function(fn_req) for fn_req in functions_needed]
 
     def _build_function(self, fn_req: dict[str, Any]) -> dict[str, Any]:
         """Build a single function definition from a requirement."""
@@ -108,11 +544,12 @@ class FunctionCreator:
         # Build parameters
         parameters = []
         for param in input_params:
-            param_type = param.get("type", "string")
+            param_name = param.get("name", "param")
             parameters.append({
-                "name": param.get("name", "param"),
-                "type": param_type,
-                "description": param.get("description", f"The {param.get('name', 'param')} value"),
+                "name": param_name,
+                "type": param.get("type", "string"),
+                # Only format the fallback description when it's needed
+                "description": param["description"] if "description" in param else f"The {param_name} value",
                 "required": param.get("required", True),
                 "default": param.get("default"),
                 "enum": param.get("enum"),
@@ -135,49 +572,43 @@ class FunctionCreator:
             "parameters": parameters,
             "returns_description": expected_output,
             "api_endpoint": endpoint,
-            "mock_response": mock,
+            "mock_response": _thaw(mock),
         }
 
-    def _infer_http_method(self, name: str, purpose: str) -> str:
+    @staticmethod
+    def _infer_http_method(name: str, purpose: str) -> str:
         """Infer the HTTP method from the function name and purpose."""
         name_lower = name.lower()
-        purpose_lower = purpose.lower()
-
-        if any(kw in name_lower for kw in ["get", "fetch", "list", "check", "search", "find", "lookup"]):
-            return "GET"
-        if any(kw in name_lower for kw in ["create", "book", "schedule", "submit", "register"]):
-            return "POST"
-        if any(kw in name_lower for kw in ["update", "modify", "change"]):
-            return "PUT"
-        if any(kw in name_lower for kw in ["delete", "cancel", "remove"]):
-            return "DELETE"
-        if any(kw in purpose_lower for kw in ["retrieve", "query", "look up"]):
+        for pattern, method in _METHOD_PATTERNS:
+            if pattern.search(name_lower):
+                return method
+        if _PURPOSE_HINTS.search(purpose.lower()):
             return "GET"
         return "POST"
 
+    @staticmethod
     def _build_endpoint(
-        self, name: str, method: str, parameters: list[dict]
+        name: str, method: str, parameters: list[dict]
     ) -> dict[str, Any]:
         """Build an API endpoint configuration."""
         # Generate URL from function name
         # e.g., get_appointment_slots → /api/v1/appointments/slots
         parts = name.split("_")
         # Remove verb prefixes
-        verbs = {"get", "fetch", "create", "book", "update", "delete", "check", "list", "search", "submit", "cancel"}
-        resource_parts = [p for p in parts if p.lower() not in verbs]
+        resource_parts = [p for p in parts if p.lower() not in _URL_VERBS]
         if not resource_parts:
             resource_parts = parts[1:] if len(parts) > 1 else parts
 
         url_path = "/".join(resource_parts)
 
-        # For GET requests with ID-like params, use path parameters
+        # For GET requests with an ID-like param, use the first as a path parameter
         if method == "GET":
-            id_params = [p for p in parameters if "id" in p["name"].lower()]
-            if id_params:
-                url_path += f"/{{{id_params[0]['name']}}}"
+            id_param = next((p["name"] for p in parameters if "id" in p["name"].lower()), None)
+            if id_param is not None:
+                url_path += f"/{{{id_param}}}"
 
         return {
-            "url": f"/api/v1/{url_path}",
+            "url": _URL_PREFIX + url_path,
             "method": method,
             "headers": {"Content-Type": "application/json"},
             "auth_type": "bearer",
@@ -189,94 +620,17 @@ class FunctionCreator:
         name: str,
         expected_output: str,
         parameters: list[dict],
-    ) -> dict[str, Any]:
-        """Generate a realistic mock response for testing."""
-        name_lower = name.lower()
-
-        # Domain-specific mock responses
-        mock_templates: dict[str, dict[str, Any]] = {
-            "appointment": {
-                "success": True,
-                "data": {
-                    "available_slots": [
-                        {"date": "2026-02-24", "time": "09:00 AM", "available": True},
-                        {"date": "2026-02-24", "time": "10:30 AM", "available": True},
-                        {"date": "2026-02-24", "time": "02:00 PM", "available": True},
-                    ],
-                    "timezone": "America/New_York",
-                },
-                "message": "Available slots retrieved successfully",
-            },
-            "book": {
-                "success": True,
-                "data": {
-                    "booking_id": "BK-20260224-001",
-                    "status": "confirmed",
-                    "confirmation_code": "CONF-7829",
-                    "date": "2026-02-24",
-                    "time": "10:30 AM",
-                },
-                "message": "Appointment booked successfully",
-            },
-            "order": {
-                "success": True,
-                "data": {
-                    "order_id": "ORD-2026-4521",
-                    "status": "shipped",
-                    "tracking_number": "1Z999AA10123456784",
-                    "estimated_delivery": "2026-02-26",
-                    "items": [
-                        {"name": "Product A", "quantity": 1, "price": 29.99}
-                    ],
-                },
-                "message": "Order details retrieved successfully",
-            },
-            "account": {
-                "success": True,
-                "data": {
-                    "account_id": "ACC-78291",
-                    "name": "John Smith",
-                    "status": "active",
-                    "balance": 1250.00,
-                    "last_activity": "2026-02-23",
-                },
-                "message": "Account information retrieved successfully",
-            },
-            "cancel": {
-                "success": True,
-                "data": {
-                    "cancellation_id": "CAN-20260224-003",
-                    "status": "cancelled",
-                    "refund_amount": 29.99,
-                    "refund_eta": "3-5 business days",
-                },
-                "message": "Cancellation processed successfully",
-            },
-            "transfer": {
-                "success": True,
-                "data": {
-                    "transfer_id": "TRF-001",
-                    "department": "Customer Support",
-                    "estimated_wait": "2 minutes",
-                    "queue_position": 3,
-                },
-                "message": "Transfer initiated",
-            },
-            "verify": {
-                "success": True,
-                "data": {
-                    "verified": True,
-                    "customer_id": "CUST-45678",
-                    "name": "John Smith",
-                },
-                "message": "Customer verified successfully",
-            },
-        }
+    ) -> Mapping[str, Any]:
+        """
+        Generate a realistic mock response for testing.
 
-        # Find matching template
-        for keyword, template in mock_templates.items():
-            if keyword in name_lower:
-                return template
+        Known domains return the shared read-only template; callers that
+        need to modify it should take a copy.
+        """
+        # Domain-specific mock response, if the name mentions a known keyword
+        keyword = _match_mock_keyword(name.lower())
+        if keyword is not None:
+            return _MOCK_TEMPLATES[keyword]
 
         # Generic fallback mock
         return {
@@ -292,33 +646,14 @@ class FunctionCreator:
     @staticmethod
     def to_openai_tools(functions: list[dict[str, Any]]) -> list[dict]:
         """Convert function definitions to OpenAI tool schemas."""
-        tools = []
-        for fn in functions:
-            properties = {}
-            required = []
-            for p in fn.get("parameters", []):
-                prop: dict[str, Any] = {
-                    "type": p.get("type", "string"),
-                    "description": p.get("description", ""),
-                }
-                if p.get("enum"):
-                    prop["enum"] = p["enum"]
-                if p.get("default") is not None:
-                    prop["default"] = p["default"]
-                properties[p["name"]] = prop
-                if p.get("required", True):
-                    required.append(p["name"])
-
-            tools.append({
+        return [
+            {
                 "type": "function",
                 "function": {
                     "name": fn["name"],
                     "description": fn.get("description", ""),
-                    "parameters": {
-                        "type": "object",
-                        "properties": properties,
-                        "required": required,
-                    },
+                    "parameters": _tool_parameters(fn.get("parameters", [])),
                 },
-            })
-        return tools
+            }
+            for fn in functions
+        ]
@@ -0,0 +1,42 @@
+"""
+JSON encode/decode helpers used on the request hot path.
+
+Prefers ``orjson`` — a C extension that is several times faster than the
+stdlib on the deeply nested, string-heavy dicts this package passes
+around (analysis briefs, agent configs, LLM responses). Falls back to the
+standard ``json`` module with equivalent compact output when ``orjson``
+is not installed.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+def dumps(obj: Any, *, sort_keys: bool = False) -> str:
+    """Serialize ``obj`` to compact JSON (no whitespace, UTF-8 unescaped)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumpb(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """``dumps`` as UTF-8 bytes, skipping orjson's decode step."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return dumps(obj, sort_keys=sort_keys).encode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document from ``str`` or ``bytes``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
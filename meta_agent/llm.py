@@ -0,0 +1,29 @@
+"""
+Per-call limits for OpenAI chat completions.
+
+The shared client's default read timeout suits streamed calls (it bounds
+the gap between chunks) and single non-streamed configs. Batched,
+non-streamed calls wait for their whole output in one response, so their
+timeout has to grow with ``max_tokens``; and retrying a multi-minute call
+only doubles the wait before the caller's own fallback kicks in.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+# GPT-4o output under load can drop to ~40 tokens/s; budget for that
+_OUTPUT_TOKENS_PER_SECOND = 40
+_BASE_READ_SECONDS = 30.0
+
+
+def completion_timeout(max_tokens: int) -> Any:
+    """``httpx.Timeout`` for a non-streamed completion of up to ``max_tokens``."""
+    import httpx
+
+    return httpx.Timeout(_BASE_READ_SECONDS + max_tokens / _OUTPUT_TOKENS_PER_SECOND, connect=10.0)
+
+
+def without_retries(llm_client: Any) -> Any:
+    """The same client with SDK retries disabled, for long batched calls."""
+    return llm_client.with_options(max_retries=0)
@@ -6,12 +6,42 @@ intents, conversation flows, and deployment settings.
 
 from __future__ import annotations
 
-import uuid
-from datetime import datetime
+import os
+import random
+import time
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
+
+# IDs only need to be unique, not unguessable: a seeded PRNG avoids the
+# os.urandom syscall uuid4() makes for every generated node and function.
+_RNG = random.Random(os.urandom(16))
+# Forked workers must not replay the parent's ID sequence (POSIX only;
+# Windows has no fork and no register_at_fork)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: _RNG.seed(os.urandom(16)))
+
+
+def _short_id(prefix: str, length: int = 8) -> str:
+    """``prefix_`` followed by ``length`` random hex digits."""
+    return f"{prefix}_{_RNG.getrandbits(length * 4):0{length}x}"
+
+
+@lru_cache(maxsize=1)
+def _iso_utc_seconds(epoch_s: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(epoch_s))
+
+
+def _utc_now_iso() -> str:
+    """
+    Current UTC time as ISO-8601 with microseconds and a ``Z`` suffix.
+    The date/time part is formatted at most once per second.
+    """
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return f"{_iso_utc_seconds(seconds)}.{nanos // 1000:06d}Z"
 
 
 # ──────────────────────────── Enums ────────────────────────────
@@ -77,8 +107,16 @@ class AgentStatus(str, Enum):
 
 # ──────────────────────────── Voice & Persona ────────────────────────────
 
+# The parts of a CXAgentConfig built from sub-agent output (voice, persona,
+# intents, functions, flow) are frozen and hold their lists as tuples: the
+# orchestrator's merge cache shares validated instances between configs
+# generated from identical output. The few dict-valued fields (endpoint
+# headers, mock responses) are still mutable and are copied per config.
+
 class VoiceConfig(BaseModel):
     """TTS voice configuration for the phone agent."""
+    model_config = ConfigDict(frozen=True)
+
     provider: VoiceProvider = VoiceProvider.GOOGLE
     voice_id: str = Field(default="en-US-Neural2-F", description="Provider-specific voice identifier")
     gender: VoiceGender = VoiceGender.FEMALE
@@ -89,10 +127,12 @@ class VoiceConfig(BaseModel):
 
 class PersonaConfig(BaseModel):
     """Defines the agent's personality and behavior."""
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(..., description="Display name of the agent, e.g. 'Ava'")
     role: str = Field(..., description="Role description, e.g. 'Appointment Scheduling Assistant'")
-    personality_traits: list[str] = Field(
-        default_factory=lambda: ["friendly", "professional", "helpful"],
+    personality_traits: tuple[str, ...] = Field(
+        default=("friendly", "professional", "helpful"),
         description="Personality adjectives"
     )
     greeting_style: str = Field(
@@ -111,9 +151,14 @@ class PersonaConfig(BaseModel):
     max_retries: int = Field(default=3, ge=1, le=5, description="Max retry attempts per slot")
 
 
+# Leaf value objects that are only ever built from already-shaped dicts
+# and serialized back out are slotted pydantic dataclasses: same validation
+# and JSON output as BaseModel, at a fraction of the per-instance memory.
+
 # ──────────────────────────── Intents ────────────────────────────
 
-class TrainingPhrase(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TrainingPhrase:
     """Example utterance for intent recognition."""
     text: str
     language: LanguageCode = LanguageCode.EN_US
@@ -121,11 +166,13 @@ class TrainingPhrase(BaseModel):
 
 class IntentDefinition(BaseModel):
     """A single conversational intent the agent can recognize."""
-    intent_id: str = Field(default_factory=lambda: f"intent_{uuid.uuid4().hex[:8]}")
+    model_config = ConfigDict(frozen=True)
+
+    intent_id: str = Field(default_factory=lambda: _short_id("intent"))
     name: str = Field(..., description="Intent name, e.g. 'book_appointment'")
     description: str = Field(..., description="What this intent represents")
-    training_phrases: list[TrainingPhrase] = Field(
-        default_factory=list,
+    training_phrases: tuple[TrainingPhrase, ...] = Field(
+        default=(),
         description="Sample utterances to train the intent classifier"
     )
     priority: int = Field(default=0, ge=0, le=10)
@@ -133,17 +180,19 @@ class IntentDefinition(BaseModel):
 
 # ──────────────────────────── Function Calls ────────────────────────────
 
-class FunctionParameter(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class FunctionParameter:
     """A single parameter for a function call."""
     name: str
     type: ParamType = ParamType.STRING
     description: str
     required: bool = True
     default: Any | None = None
-    enum: list[str] | None = None
+    enum: tuple[str, ...] | None = None
 
 
-class APIEndpoint(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class APIEndpoint:
     """Backend API endpoint that a function call maps to."""
     url: str = Field(..., description="Full URL or path template, e.g. /api/appointments/slots")
     method: HTTPMethod = HTTPMethod.POST
@@ -157,10 +206,12 @@ class FunctionDefinition(BaseModel):
     A callable function that the CX agent can invoke during conversation.
     Maps to OpenAI-style function calling schema.
     """
-    function_id: str = Field(default_factory=lambda: f"fn_{uuid.uuid4().hex[:8]}")
+    model_config = ConfigDict(frozen=True)
+
+    function_id: str = Field(default_factory=lambda: _short_id("fn"))
     name: str = Field(..., description="Function name, e.g. 'get_appointment_slots'")
     description: str = Field(..., description="What the function does, for LLM context")
-    parameters: list[FunctionParameter] = Field(default_factory=list)
+    parameters: tuple[FunctionParameter, ...] = Field(default=())
     returns_description: str = Field(default="", description="Description of the return value")
     api_endpoint: APIEndpoint | None = Field(
         default=None,
@@ -181,7 +232,7 @@ class FunctionDefinition(BaseModel):
                 "description": p.description,
             }
             if p.enum:
-                prop["enum"] = p.enum
+                prop["enum"] = list(p.enum)
             if p.default is not None:
                 prop["default"] = p.default
             properties[p.name] = prop
@@ -204,7 +255,8 @@ class FunctionDefinition(BaseModel):
 
 # ──────────────────────────── Conversation Flow ────────────────────────────
 
-class FlowTransition(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class FlowTransition:
     """Edge in the conversation flow graph."""
     condition: str = Field(..., description="Condition label, e.g. 'user_provides_name' or 'api_success'")
     target_node_id: str = Field(..., description="ID of the next node")
@@ -212,7 +264,9 @@ class FlowTransition(BaseModel):
 
 class FlowNode(BaseModel):
     """A single node in the conversation flow graph."""
-    node_id: str = Field(default_factory=lambda: f"node_{uuid.uuid4().hex[:8]}")
+    model_config = ConfigDict(frozen=True)
+
+    node_id: str = Field(default_factory=lambda: _short_id("node"))
     type: NodeType
     label: str = Field(..., description="Human-readable label for this step")
     prompt_text: str | None = Field(default=None, description="What the agent says at this node")
@@ -224,16 +278,18 @@ class FlowNode(BaseModel):
         default=None,
         description="Function name to invoke at this node (must match a FunctionDefinition.name)"
     )
-    transitions: list[FlowTransition] = Field(default_factory=list)
+    transitions: tuple[FlowTransition, ...] = Field(default=())
 
 
 class ConversationFlow(BaseModel):
     """Complete conversation flow graph for the agent."""
-    flow_id: str = Field(default_factory=lambda: f"flow_{uuid.uuid4().hex[:8]}")
+    model_config = ConfigDict(frozen=True)
+
+    flow_id: str = Field(default_factory=lambda: _short_id("flow"))
     name: str
     description: str
     entry_node_id: str = Field(..., description="ID of the first node in the flow")
-    nodes: list[FlowNode] = Field(default_factory=list)
+    nodes: tuple[FlowNode, ...] = Field(default=())
 
 
 # ──────────────────────────── Top-Level Agent Config ────────────────────────────
@@ -254,10 +310,10 @@ class CXAgentConfig(BaseModel):
     Complete configuration for a generated CX phone agent.
     This is the primary output of the Meta Agent.
     """
-    agent_id: str = Field(default_factory=lambda: f"agent_{uuid.uuid4().hex[:12]}")
+    agent_id: str = Field(default_factory=lambda: _short_id("agent", 12))
     version: str = "1.0.0"
     status: AgentStatus = AgentStatus.DRAFT
-    created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+    created_at: str = Field(default_factory=_utc_now_iso)
     persona: PersonaConfig
     voice: VoiceConfig
     intents: list[IntentDefinition] = Field(default_factory=list)
@@ -296,4 +352,4 @@ class AgentCreateResponse(BaseModel):
 class HealthResponse(BaseModel):
     status: str = "healthy"
     version: str = "1.0.0"
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+    timestamp: str = Field(default_factory=_utc_now_iso)
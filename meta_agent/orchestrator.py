@@ -15,34 +15,416 @@ This module supports two modes:
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
+import importlib.util
 import logging
 import re
-from typing import Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping, Optional
 
+from . import jsonlib
 from .agent_creator import AgentCreator
 from .function_creator import FunctionCreator
+from .llm import completion_timeout, without_retries
 from .models import (
     AgentCreateRequest,
     AgentCreateResponse,
     AgentStatus,
     CXAgentConfig,
-    ConversationFlow,
-    DeploymentConfig,
-    FlowNode,
-    FlowTransition,
     FunctionDefinition,
-    FunctionParameter,
-    IntentDefinition,
-    PersonaConfig,
-    TrainingPhrase,
-    VoiceConfig,
-    APIEndpoint,
+    _short_id,
 )
 from .prompts import META_ORCHESTRATOR_PROMPT
+from .streaming import iter_json_members, iter_stream_text
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - exercised only without pyahocorasick
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# ──────────────────── Rule-Based Analysis Tables ────────────────────
+
+_DOMAIN_KEYWORDS: Mapping[str, tuple[str, ...]] = MappingProxyType({
+    "healthcare": ("appointment", "doctor", "clinic", "hospital", "patient", "medical", "health", "therapy"),
+    "e-commerce": ("order", "product", "shipping", "cart", "purchase", "delivery", "shop", "store", "buy"),
+    "finance": ("account", "balance", "transaction", "payment", "loan", "bank", "card", "credit"),
+    "travel": ("flight", "hotel", "booking", "reservation", "travel", "trip", "airline"),
+    "telecommunications": ("plan", "data", "mobile", "phone bill", "sim", "network", "roaming"),
+    "food_delivery": ("food", "restaurant", "delivery", "menu", "order food", "meal"),
+    "insurance": ("claim", "policy", "insurance", "coverage", "premium"),
+    "education": ("course", "class", "enrollment", "student", "tutor", "training"),
+    "real_estate": ("property", "rent", "lease", "apartment", "house", "real estate"),
+    "automotive": ("car", "vehicle", "service", "repair", "maintenance", "dealership"),
+})
+
+_SLOT_KEYWORDS: Mapping[str, tuple[str, ...]] = MappingProxyType({
+    "customer_name": ("name", "first name", "last name", "full name", "caller name", "user name"),
+    "email": ("email", "e-mail", "email address", "mail"),
+    "phone_number": ("phone", "phone number", "mobile", "contact number", "cell"),
+    "preferred_date": ("date", "day", "when", "preferred date", "appointment date"),
+    "preferred_time": ("time", "preferred time", "appointment time", "what time"),
+    "address": ("address", "location", "where"),
+    "service_type": ("service", "service type", "type of service"),
+    "reason": ("reason", "purpose", "why"),
+    "order_number": ("order number", "order id", "order #"),
+    "account_number": ("account number", "account id", "account #"),
+    "issue_description": ("issue", "problem", "complaint", "describe"),
+    "age": ("age", "how old"),
+    "dob": ("date of birth", "dob", "birthday"),
+    "insurance_id": ("insurance", "insurance id", "policy number"),
+    "company_name": ("company", "organization", "business name"),
+})
+
+
+@dataclass(frozen=True, slots=True)
+class _TaskPattern:
+    """A task the rule analysis can detect, and the keywords that trigger it."""
+    keywords: tuple[str, ...]
+    task_name: str
+    description: str
+    data_to_collect: tuple[str, ...]
+    requires_api: bool
+    api_description: str
+
+    def as_task(self, with_keywords: bool = False) -> dict[str, Any]:
+        """Fresh analysis-brief task dict (callers may mutate its lists)."""
+        task: dict[str, Any] = {"keywords": list(self.keywords)} if with_keywords else {}
+        task["task_name"] = self.task_name
+        task["description"] = self.description
+        task["data_to_collect"] = list(self.data_to_collect)
+        task["requires_api"] = self.requires_api
+        task["api_description"] = self.api_description
+        return task
+
+
+_TASK_PATTERNS: Mapping[str, _TaskPattern] = MappingProxyType({
+    "greet": _TaskPattern(
+        keywords=("greet", "welcome", "hello", "introduce"),
+        task_name="Greeting",
+        description="Greet the caller and introduce the service",
+        data_to_collect=(),
+        requires_api=False,
+        api_description="",
+    ),
+    "collect_name": _TaskPattern(
+        keywords=("take name", "ask name", "collect name", "get name", "ask for name"),
+        task_name="Collect Customer Name",
+        description="Collect the caller's name for personalization",
+        data_to_collect=("customer_name",),
+        requires_api=False,
+        api_description="",
+    ),
+    "collect_email": _TaskPattern(
+        keywords=("email", "e-mail", "mail address"),
+        task_name="Collect Email",
+        description="Collect the caller's email address",
+        data_to_collect=("email",),
+        requires_api=False,
+        api_description="",
+    ),
+    "collect_phone": _TaskPattern(
+        keywords=("phone number", "mobile number", "contact number"),
+        task_name="Collect Phone Number",
+        description="Collect the caller's phone number",
+        data_to_collect=("phone_number",),
+        requires_api=False,
+        api_description="",
+    ),
+    "appointment": _TaskPattern(
+        keywords=("appointment", "schedule", "book", "booking", "slot"),
+        task_name="Appointment Booking",
+        description="Book an appointment for the customer",
+        data_to_collect=("customer_name", "preferred_date", "preferred_time"),
+        requires_api=True,
+        api_description="Check available appointment slots and book an appointment",
+    ),
+    "order_status": _TaskPattern(
+        keywords=("order status", "track order", "where is my order", "order tracking"),
+        task_name="Order Status Check",
+        description="Check the status of a customer's order",
+        data_to_collect=("order_number",),
+        requires_api=True,
+        api_description="Look up order status by order number",
+    ),
+    "account_inquiry": _TaskPattern(
+        keywords=("account", "balance", "statement"),
+        task_name="Account Inquiry",
+        description="Look up customer account information",
+        data_to_collect=("account_number",),
+        requires_api=True,
+        api_description="Retrieve account details and balance",
+    ),
+    "complaint": _TaskPattern(
+        keywords=("complaint", "issue", "problem", "wrong"),
+        task_name="File Complaint",
+        description="Record and process a customer complaint",
+        data_to_collect=("customer_name", "issue_description"),
+        requires_api=True,
+        api_description="Submit a customer complaint ticket",
+    ),
+    "cancel": _TaskPattern(
+        keywords=("cancel", "cancellation", "refund"),
+        task_name="Cancellation Processing",
+        description="Process a cancellation or refund request",
+        data_to_collect=("order_number", "cancellation_reason"),
+        requires_api=True,
+        api_description="Process cancellation and initiate refund",
+    ),
+    "confirm": _TaskPattern(
+        keywords=("confirm", "verify", "availability", "available"),
+        task_name="Confirm Availability",
+        description="Confirm availability via external system",
+        data_to_collect=(),
+        requires_api=True,
+        api_description="Verify availability through the backend API",
+    ),
+    "faq": _TaskPattern(
+        keywords=("faq", "question", "information", "info", "help"),
+        task_name="FAQ & Information",
+        description="Answer frequently asked questions",
+        data_to_collect=(),
+        requires_api=False,
+        api_description="",
+    ),
+})
+
+# Fallback tasks when the prompt names nothing beyond a greeting
+_DOMAIN_DEFAULT_TASKS: Mapping[str, _TaskPattern] = MappingProxyType({
+    "healthcare": _TASK_PATTERNS["appointment"],
+    "e-commerce": _TASK_PATTERNS["order_status"],
+    "finance": _TASK_PATTERNS["account_inquiry"],
+})
+_GENERAL_INQUIRY_TASK = _TaskPattern(
+    keywords=(),
+    task_name="General Inquiry",
+    description="Handle general customer inquiries",
+    data_to_collect=("customer_name", "inquiry_details"),
+    requires_api=False,
+    api_description="",
+)
+
+# task_name → snake_case key for _TASK_FUNCTION_NAMES, computed once per pattern
+_TASK_KEYS: Mapping[str, str] = MappingProxyType({
+    p.task_name: p.task_name.lower().replace(" ", "_")
+    for p in (*_TASK_PATTERNS.values(), _GENERAL_INQUIRY_TASK)
+})
+
+_VOICE_PHRASES: Mapping[str, tuple[str, ...]] = MappingProxyType({
+    "male": ("male voice", "male agent"),
+    "female": ("female voice", "female agent"),
+})
+
+_STYLE_WORDS: Mapping[str, tuple[str, ...]] = MappingProxyType({
+    "formal": ("formal",),
+    "casual": ("casual", "friendly"),
+})
+
+# Analysis task (snake_case task_name) → backend function name
+_TASK_FUNCTION_NAMES: Mapping[str, str] = MappingProxyType({
+    "appointment_booking": "get_appointment_slots",
+    "order_status_check": "get_order_status",
+    "account_inquiry": "get_account_info",
+    "file_complaint": "submit_complaint",
+    "cancellation_processing": "process_cancellation",
+    "confirm_availability": "check_availability",
+    "general_inquiry": "search_knowledge_base",
+})
+
+_FUNCTION_OUTPUTS: Mapping[str, str] = MappingProxyType({
+    "get_appointment_slots": "List of available appointment slots with dates and times",
+    "book_appointment": "Booking confirmation with confirmation code",
+    "get_order_status": "Order status including tracking info and estimated delivery",
+    "get_account_info": "Account details including balance and recent activity",
+    "submit_complaint": "Complaint ticket ID and status",
+    "process_cancellation": "Cancellation confirmation and refund details",
+    "check_availability": "Availability status with available options",
+    "search_knowledge_base": "Relevant FAQ entries or knowledge base articles",
+})
+
+_DOMAIN_AGENT_NAMES: Mapping[str, str] = MappingProxyType({
+    "healthcare": "MediBot",
+    "e-commerce": "ShopAssist",
+    "finance": "FinanceHelper",
+    "travel": "TravelBuddy",
+    "telecommunications": "TeleConnect",
+    "food_delivery": "FoodieBot",
+    "insurance": "InsureGuide",
+    "education": "EduAssist",
+    "real_estate": "PropertyPal",
+    "automotive": "AutoCare",
+    "general_support": "Ava",
+})
+
+_DOMAIN_ROLES: Mapping[str, str] = MappingProxyType({
+    "healthcare": "Appointment & Patient Support Agent",
+    "e-commerce": "Order & Shopping Support Agent",
+    "finance": "Account & Financial Support Agent",
+    "travel": "Booking & Travel Support Agent",
+    "telecommunications": "Service & Billing Support Agent",
+    "food_delivery": "Order & Delivery Support Agent",
+    "insurance": "Claims & Policy Support Agent",
+    "education": "Enrollment & Course Support Agent",
+    "real_estate": "Property & Leasing Support Agent",
+    "automotive": "Service & Repair Support Agent",
+    "general_support": "Customer Support Agent",
+})
+
+_NAME_SANITIZER = re.compile(r"[^a-z0-9_]")
+
+
+def _slot_param_type(slot: str) -> str:
+    """Function parameter type for a slot (slot names are already lowercase)."""
+    if "date" in slot:
+        return "string"  # ISO date string
+    if "number" in slot or "amount" in slot:
+        return "string"
+    if "count" in slot or "quantity" in slot:
+        return "integer"
+    return "string"
+
+
+class _KeywordScanner:
+    """
+    Every rule-analysis keyword table behind one lookup: ``scan`` reports
+    each ``(table, key)`` with a keyword present in the text — the same
+    answers as ``any(kw in text for kw in keywords)`` per key.
+
+    With ``pyahocorasick`` installed this is a single Aho-Corasick pass
+    over the text (about 5x faster on typical prompts); otherwise each
+    distinct keyword is checked once with ``in``.
+    """
+
+    def __init__(self, tables: Mapping[str, Mapping[str, tuple[str, ...]]]):
+        tags: dict[str, set[tuple[str, str]]] = {}
+        for kind, table in tables.items():
+            for key, keywords in table.items():
+                for kw in keywords:
+                    tags.setdefault(kw, set()).add((kind, key))
+        self._tags = {kw: frozenset(t) for kw, t in tags.items()}
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for kw, kw_tags in self._tags.items():
+                self._automaton.add_word(kw, kw_tags)
+            self._automaton.make_automaton()
+
+    def scan(self, text: str) -> set[tuple[str, str]]:
+        hits: set[tuple[str, str]] = set()
+        if self._automaton is not None:
+            for _, kw_tags in self._automaton.iter(text):
+                hits |= kw_tags
+        else:
+            for kw, kw_tags in self._tags.items():
+                if kw in text:
+                    hits |= kw_tags
+        return hits
+
+
+_KEYWORD_SCANNER = _KeywordScanner({
+    "domain": _DOMAIN_KEYWORDS,
+    "slot": _SLOT_KEYWORDS,
+    "task": {k: p.keywords for k, p in _TASK_PATTERNS.items() if k != "greet"},
+    "voice": _VOICE_PHRASES,
+    "style": _STYLE_WORDS,
+})
+
+# CXAgentConfig fields built from the sub-agent outputs (cached by _merge_config)
+_CONFIG_PARTS = ("persona", "voice", "intents", "functions", "conversation_flow")
+
+# Raw flow-node keys _config_parts fills in when a node lacks them
+_FLOW_NODE_FIELDS = frozenset(
+    ("node_id", "type", "label", "prompt_text", "collect_slot", "function_call", "transitions")
+)
+
+
+def _ask_for_slot(slot: str) -> str:
+    return f"Ask for the customer's {slot.replace('_', ' ')}"
+
+
+# Flow-summary step for every slot the rule tables can produce
+_ASK_FOR_SLOT: Mapping[str, str] = MappingProxyType({
+    slot: _ask_for_slot(slot)
+    for slot in (
+        *_SLOT_KEYWORDS,
+        *(s for p in (*_TASK_PATTERNS.values(), _GENERAL_INQUIRY_TASK) for s in p.data_to_collect),
+    )
+})
+
+
+def make_llm_client(api_key: str):
+    """
+    Build an ``AsyncOpenAI`` client on a keep-alive connection pool.
+
+    Create one per process and share it: the pool only saves TCP + TLS
+    handshakes if the client outlives individual requests. HTTP/2 is used
+    when the ``h2`` package is installed (``pip install httpx[http2]``).
+    Raises ImportError if the openai package is missing.
+    """
+    import httpx
+    from openai import AsyncOpenAI
+
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        # Default for streamed calls (bounds the gap between chunks); long
+        # non-streamed calls pass a per-call llm.completion_timeout
+        timeout=httpx.Timeout(120.0, connect=10.0),
+        http2=importlib.util.find_spec("h2") is not None,
+    )
+    # FunctionCreator layers its own 429 backoff on top of these retries
+    return AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=2)
+
+
+async def _encoded(analysis: Awaitable[dict[str, Any]]) -> bytes:
+    """Await an analysis and keep it as JSON; every cache hit decodes its own copy."""
+    return jsonlib.dumpb(await analysis)
+
+
+def _json_copy(value: Any) -> Any:
+    """Deep copy of JSON data (an orjson round trip beats ``copy.deepcopy``)."""
+    return jsonlib.loads(jsonlib.dumpb(value))
+
+
+class _FunctionsPrefetch:
+    """
+    Function generation started from a streamed analysis as soon as its
+    ``functions_needed`` member closes, before the rest of the brief
+    (flow summary, ambiguities, ...) has been generated.
+
+    One per consumer request. Once ``cancel()`` has run, a late
+    ``start()`` from the analysis stream is ignored, so a request that
+    went away leaves no orphaned generation task behind.
+    """
+
+    def __init__(self, function_creator: FunctionCreator):
+        self._function_creator = function_creator
+        self._needed: list[dict[str, Any]] | None = None
+        self._task: asyncio.Future | None = None
+        self._cancelled = False
+
+    def start(self, functions_needed: list[dict[str, Any]]) -> None:
+        if self._cancelled:
+            return
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._needed = functions_needed
+        self._task = asyncio.ensure_future(self._function_creator.create_functions(functions_needed))
+
+    def result_for(self, functions_needed: list[dict[str, Any]]) -> asyncio.Future:
+        """The prefetched task if it was started for these requirements, else a new one."""
+        if self._task is None or self._needed != functions_needed:
+            self.start(functions_needed)
+        return self._task
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
 
 class MetaOrchestrator:
     """
@@ -72,6 +454,17 @@ class MetaOrchestrator:
           CXAgentConfig (JSON)
     """
 
+    # Most recent LLM analyses kept for identical repeat requests
+    analysis_cache_max_entries = 256
+    # Prompts analyzed per completion by process_requests_batch (each brief
+    # is ~3k output tokens, so 5 stays inside gpt-4o's 16k output limit)
+    analysis_batch_size = 5
+    # Validated config parts kept for re-merging identical sub-agent outputs
+    merged_parts_cache_max_entries = 64
+
+    # One orchestrator (and so one connection pool) per API key, see get_shared
+    _shared: dict[str | None, "MetaOrchestrator"] = {}
+
     def __init__(self, openai_api_key: str | None = None):
         """
         Initialize the Meta Orchestrator.
@@ -83,8 +476,7 @@ class MetaOrchestrator:
         self.llm_client = None
         if openai_api_key:
             try:
-                from openai import AsyncOpenAI
-                self.llm_client = AsyncOpenAI(api_key=openai_api_key)
+                self.llm_client = make_llm_client(openai_api_key)
                 logger.info("Initialized with OpenAI LLM client")
             except ImportError:
                 logger.warning("openai package not installed, using rule-based mode")
@@ -94,6 +486,54 @@ class MetaOrchestrator:
         self.agent_creator = AgentCreator(llm_client=self.llm_client)
         self.function_creator = FunctionCreator(llm_client=self.llm_client)
         self.system_prompt = META_ORCHESTRATOR_PROMPT
+        # LLM analyses (as JSON bytes) keyed by a hash of (prompt, language,
+        # platform). Each entry is the future of the call, so concurrent
+        # identical requests share one completion instead of racing to make
+        # their own.
+        self._analysis_cache: OrderedDict[str, asyncio.Future] = OrderedDict()
+        # For analyses still streaming: resolves with the brief's
+        # functions_needed as soon as it closes, for every waiting request
+        self._early_functions: dict[str, asyncio.Future] = {}
+        # Sub-agent outputs (JSON) → validated CXAgentConfig parts (see _merge_config)
+        self._merged_parts_cache: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
+
+    @classmethod
+    def get_shared(cls, openai_api_key: str | None = None) -> "MetaOrchestrator":
+        """
+        Process-wide orchestrator for ``openai_api_key``, created on first
+        use. Reusing it keeps the HTTP connection pool and the analysis and
+        generation caches warm across requests.
+        """
+        orchestrator = cls._shared.get(openai_api_key)
+        if orchestrator is None:
+            orchestrator = cls._shared[openai_api_key] = cls(openai_api_key)
+        return orchestrator
+
+    async def aclose(self) -> None:
+        """
+        Stop the Agent Creator's batch worker and close the pooled HTTP
+        connections (call on app shutdown).
+        """
+        for key, shared in list(self._shared.items()):
+            if shared is self:
+                del self._shared[key]
+        await self.agent_creator.aclose()
+        if self.llm_client:
+            await self.llm_client.close()
+
+    async def warmup(self, timeout: float = 5.0) -> None:
+        """
+        Open a pooled connection to the OpenAI API ahead of the first
+        request, so it doesn't pay the TCP + TLS handshake. Failures are
+        logged and ignored — the first real request just connects itself.
+        """
+        if not self.llm_client:
+            return
+        try:
+            await asyncio.wait_for(self.llm_client.models.list(), timeout)
+            logger.info("OpenAI connection pool warmed up")
+        except Exception as e:
+            logger.warning("OpenAI warmup failed (%s), continuing without it", e)
 
     async def process_request(self, request: AgentCreateRequest) -> AgentCreateResponse:
         """
@@ -106,41 +546,55 @@ class MetaOrchestrator:
           4. Merge everything into a CXAgentConfig
           5. Return structured response
         """
+        if self._rules_only:
+            return self._process_with_rules(request)
+
+        functions = _FunctionsPrefetch(self.function_creator)
         try:
-            # Step 1: Analyze the request
+            # Step 1: Analyze the request (an LLM analysis may already start
+            # Step 3 while the tail of the brief is still streaming)
             logger.info("Step 1: Analyzing user request...")
-            analysis = await self._analyze_request(request.user_prompt, request.language.value, request.platform)
-
-            # Step 2: Create agent configuration
-            logger.info("Step 2: Creating agent configuration...")
-            agent_config_raw = await self.agent_creator.create_agent_config(analysis)
+            analysis = await self._analyze_request(
+                request.user_prompt, request.language.value, request.platform,
+                on_functions_needed=functions.start,
+            )
 
-            # Step 3: Create function definitions
-            logger.info("Step 3: Creating function definitions...")
+            # Steps 2 + 3 only depend on the analysis, so run them concurrently
+            logger.info("Steps 2-3: Creating agent configuration and function definitions...")
             functions_needed = analysis.get("functions_needed", [])
-            functions_raw = await self.function_creator.create_functions(functions_needed)
-
-            # Step 4: Merge into CXAgentConfig
-            logger.info("Step 4: Merging into final configuration...")
-            agent_config = self._merge_config(
-                analysis=analysis,
-                agent_config=agent_config_raw,
-                functions=functions_raw,
-                platform=request.platform,
+            agent_config_raw, functions_raw = await asyncio.gather(
+                self.agent_creator.create_agent_config(analysis),
+                functions.result_for(functions_needed),
             )
 
-            # Step 5: Generate OpenAI tool schemas
-            openai_tools = self.function_creator.to_openai_tools(functions_raw)
+            return self._build_response(request, analysis, agent_config_raw, functions_raw)
 
+        except Exception as e:
+            logger.exception("Failed to process request")
             return AgentCreateResponse(
-                success=True,
-                message=f"Successfully created CX agent '{agent_config.persona.name}' "
-                        f"with {len(agent_config.functions)} functions and "
-                        f"{len(agent_config.intents)} intents.",
-                agent_config=agent_config,
-                openai_tools_schema=openai_tools,
-                raw_analysis=analysis,
+                success=False,
+                message=f"Failed to create agent: {str(e)}",
+                agent_config=None,
             )
+        finally:
+            functions.cancel()
+
+    @property
+    def _rules_only(self) -> bool:
+        """True when no stage has an LLM client, so every step is plain CPU work."""
+        return not (self.llm_client or self.agent_creator.llm_client or self.function_creator.llm_client)
+
+    def _process_with_rules(self, request: AgentCreateRequest) -> AgentCreateResponse:
+        """
+        ``process_request`` for rule-based mode, run in a single stack
+        frame. The rule builders take tens of microseconds, less than the
+        task and executor hops that the concurrent LLM pipeline would add.
+        """
+        try:
+            analysis = self._analyze_with_rules(request.user_prompt, request.language.value, request.platform)
+            agent_config_raw = self.agent_creator.create_agent_config_with_rules(analysis)
+            functions_raw = self.function_creator.create_functions_with_rules(analysis.get("functions_needed", []))
+            return self._build_response(request, analysis, agent_config_raw, functions_raw)
 
         except Exception as e:
             logger.exception("Failed to process request")
@@ -150,39 +604,355 @@ class MetaOrchestrator:
                 agent_config=None,
             )
 
-    # ────────────────── Step 1: Analyze Request ──────────────────
+    async def process_requests_batch(
+        self,
+        requests: list[AgentCreateRequest],
+        max_concurrency: int = 20,
+    ) -> list[AgentCreateResponse]:
+        """
+        Create many agents at once (bulk CLI runs, test sweeps).
 
-    async def _analyze_request(self, user_prompt: str, language: str, platform: str) -> dict[str, Any]:
+        Requests are processed concurrently, at most ``max_concurrency``
+        at a time, and responses are returned in input order. Failures
+        are reported per request, as in ``process_request``.
         """
-        Parse the user's natural language into a structured analysis brief.
+        return await self._run_bulk(requests, max_concurrency, self.process_request)
+
+    async def analyze_batch(
+        self,
+        requests: list[AgentCreateRequest],
+        max_concurrency: int = 32,
+    ) -> list[dict[str, Any]]:
+        """
+        Step 1 only, for many requests: their analysis briefs in input order.
+
+        Shares the batched completions and analysis cache of
+        ``process_requests_batch``; at most ``max_concurrency`` analyses
+        are awaited at a time. Failed LLM analyses fall back to rules.
+        """
+        if self._rules_only:
+            return [
+                self._analyze_with_rules(r.user_prompt, r.language.value, r.platform)
+                for r in requests
+            ]
+
+        return await self._run_bulk(
+            requests, max_concurrency,
+            lambda r: self._analyze_request(r.user_prompt, r.language.value, r.platform),
+        )
+
+    async def _run_bulk(
+        self,
+        requests: list[AgentCreateRequest],
+        max_concurrency: int,
+        run_one: Callable[[AgentCreateRequest], Awaitable[Any]],
+    ) -> list[Any]:
+        """
+        Shared driver of the batch entry points: prefetch the LLM analyses in
+        batched completions, then run ``run_one`` per request, at most
+        ``max_concurrency`` at a time, returning results in input order.
         """
         if self.llm_client:
-            return await self._analyze_with_llm(user_prompt, language, platform)
-        return self._analyze_with_rules(user_prompt, language, platform)
+            self._prefetch_analyses(requests, max_concurrency)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(request: AgentCreateRequest) -> Any:
+            async with semaphore:
+                return await run_one(request)
 
-    async def _analyze_with_llm(self, user_prompt: str, language: str, platform: str) -> dict[str, Any]:
-        """Use GPT to analyze the user request."""
+        return list(await asyncio.gather(*(run(r) for r in requests)))
+
+    async def stream_request(
+        self, request: AgentCreateRequest
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Streaming variant of ``process_request``.
+
+        Yields ``(event, data)`` pairs as each stage completes:
+        ``analysis``, then the agent sections (``persona``, ``voice``,
+        ``intents``, ``conversation_flow``) as the Agent Creator produces
+        them, then ``functions``, and finally ``result`` carrying the
+        complete ``AgentCreateResponse``. Function generation runs
+        concurrently with the agent-config stream.
+        """
+        functions = _FunctionsPrefetch(self.function_creator)
         try:
-            augmented_prompt = (
-                f"User request: {user_prompt}\n\n"
-                f"Preferred language: {language}\n"
-                f"Target platform: {platform}"
+            analysis = await self._analyze_request(
+                request.user_prompt, request.language.value, request.platform,
+                on_functions_needed=functions.start,
             )
-            response = await self.llm_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": augmented_prompt},
-                ],
-                temperature=0.3,
-                max_tokens=3000,
-                response_format={"type": "json_object"},
+            yield "analysis", analysis
+
+            functions_task = functions.result_for(analysis.get("functions_needed", []))
+            agent_config_raw: dict[str, Any] = {}
+            async for name, section in self.agent_creator.stream_agent_config(analysis):
+                agent_config_raw[name] = section
+                yield name, section
+
+            functions_raw = await functions_task
+            yield "functions", functions_raw
+
+            response = self._build_response(request, analysis, agent_config_raw, functions_raw)
+        except Exception as e:
+            logger.exception("Failed to process streamed request")
+            response = AgentCreateResponse(
+                success=False,
+                message=f"Failed to create agent: {str(e)}",
+                agent_config=None,
             )
-            raw = response.choices[0].message.content
-            return json.loads(raw)
+        finally:
+            functions.cancel()
+
+        yield "result", response
+
+    async def process_request_stream(self, request: AgentCreateRequest) -> AsyncIterator[bytes]:
+        """
+        NDJSON encoding of ``stream_request``: one
+        ``{"event": ..., "data": ...}`` line per stage, ending with the
+        ``result`` line that carries the full ``AgentCreateResponse``.
+        """
+        async for event, data in self.stream_request(request):
+            if event == "result":
+                data = data.model_dump(mode="json")
+            yield (jsonlib.dumps({"event": event, "data": data}) + "\n").encode("utf-8")
+
+    def _build_response(
+        self,
+        request: AgentCreateRequest,
+        analysis: dict[str, Any],
+        agent_config_raw: dict[str, Any],
+        functions_raw: list[dict[str, Any]],
+    ) -> AgentCreateResponse:
+        """Steps 4-5: merge sub-agent outputs and wrap them in a response."""
+        # Step 4: Merge into CXAgentConfig
+        logger.info("Step 4: Merging into final configuration...")
+        agent_config = self._merge_config(
+            analysis=analysis,
+            agent_config=agent_config_raw,
+            functions=functions_raw,
+            platform=request.platform,
+        )
+
+        # Step 5: Generate OpenAI tool schemas (cached on the config)
+        openai_tools = agent_config.get_openai_tools()
+
+        return AgentCreateResponse(
+            success=True,
+            message=f"Successfully created CX agent '{agent_config.persona.name}' "
+                    f"with {len(agent_config.functions)} functions and "
+                    f"{len(agent_config.intents)} intents.",
+            agent_config=agent_config,
+            openai_tools_schema=openai_tools,
+            raw_analysis=analysis,
+        )
+
+    # ────────────────── Step 1: Analyze Request ──────────────────
+
+    async def _analyze_request(
+        self,
+        user_prompt: str,
+        language: str,
+        platform: str,
+        on_functions_needed: Callable[[list[dict[str, Any]]], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Parse the user's natural language into a structured analysis brief.
+
+        ``on_functions_needed`` is called with the brief's function
+        requirements as soon as the streamed LLM analysis completes them,
+        whether this request started that analysis or joined one already
+        in flight. It is not called for rule-based or finished analyses.
+        """
+        if not self.llm_client:
+            return self._analyze_with_rules(user_prompt, language, platform)
+
+        key = self._analysis_key(user_prompt, language, platform)
+        future = self._analysis_cache.get(key)
+        if future is None:
+            early = asyncio.get_running_loop().create_future()
+            future = asyncio.ensure_future(_encoded(
+                self._analyze_with_llm(user_prompt, language, platform, self._early_setter(early))
+            ))
+            self._early_functions[key] = early
+            future.add_done_callback(lambda _: self._drop_early(key, early))
+            self._cache_analysis(key, future)
+        else:
+            self._analysis_cache.move_to_end(key)
+
+        early = self._early_functions.get(key)
+        if on_functions_needed is not None and early is not None:
+            def forward(done: asyncio.Future) -> None:
+                if not done.cancelled():
+                    on_functions_needed(done.result())
+            early.add_done_callback(forward)
+
+        try:
+            # Shielded: one caller giving up mustn't cancel the shared call
+            encoded = await asyncio.shield(future)
         except Exception as e:
+            # Failures aren't cached; the next request tries the LLM again
+            if self._analysis_cache.get(key) is future:
+                del self._analysis_cache[key]
             logger.warning("LLM analysis failed (%s), falling back to rules", e)
             return self._analyze_with_rules(user_prompt, language, platform)
+        # A fresh decode is each caller's private copy (several times
+        # cheaper than deepcopying the nested brief)
+        return jsonlib.loads(encoded)
+
+    @staticmethod
+    def _early_setter(early: asyncio.Future) -> Callable[[list[dict[str, Any]]], None]:
+        def set_early(functions_needed: list[dict[str, Any]]) -> None:
+            if not early.done():
+                early.set_result(functions_needed)
+        return set_early
+
+    def _drop_early(self, key: str, early: asyncio.Future) -> None:
+        """Analysis finished: late joiners just read the brief itself."""
+        if self._early_functions.get(key) is early:
+            del self._early_functions[key]
+        early.cancel()
+
+    @staticmethod
+    def _analysis_key(user_prompt: str, language: str, platform: str) -> str:
+        # Whitespace-normalized, so re-pasted prompts that only differ in
+        # spacing or line breaks share one analysis
+        normalized = " ".join(user_prompt.split())
+        return hashlib.blake2b(
+            f"{normalized}\x00{language}\x00{platform}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    def _cache_analysis(self, key: str, future: asyncio.Future) -> None:
+        self._analysis_cache[key] = future
+        while len(self._analysis_cache) > self.analysis_cache_max_entries:
+            self._analysis_cache.popitem(last=False)
+
+    def _prefetch_analyses(self, requests: list[AgentCreateRequest], max_concurrency: int) -> None:
+        """
+        Seed the analysis cache for a bulk run with batched completions,
+        ``analysis_batch_size`` prompts per call, so the system prompt is
+        billed once per batch instead of once per request. The subsequent
+        ``_analyze_request`` calls then just await their cached future.
+
+        Batches run in order, enough at a time to cover about
+        ``max_concurrency`` requests. They get their own limiter: the
+        callers' semaphore is held while awaiting these very results.
+        """
+        triples: dict[str, tuple[str, str, str]] = {}
+        for r in requests:
+            triple = (r.user_prompt, r.language.value, r.platform)
+            key = self._analysis_key(*triple)
+            if key not in self._analysis_cache:
+                triples.setdefault(key, triple)
+
+        # More than the cache holds would evict early entries before use
+        pending = list(triples.items())[: self.analysis_cache_max_entries]
+        limiter = asyncio.Semaphore(max(1, max_concurrency // self.analysis_batch_size))
+
+        async def analyze_batch(batch_triples: list[tuple[str, str, str]]) -> list[dict[str, Any] | None]:
+            async with limiter:
+                return await self._analyze_with_llm_batch(batch_triples)
+
+        for start in range(0, len(pending), self.analysis_batch_size):
+            batch = pending[start:start + self.analysis_batch_size]
+            batch_task = asyncio.ensure_future(analyze_batch([t for _, t in batch]))
+            for index, (key, triple) in enumerate(batch):
+                self._cache_analysis(
+                    key, asyncio.ensure_future(_encoded(self._batched_analysis(batch_task, index, triple)))
+                )
+
+    async def _batched_analysis(
+        self, batch_task: asyncio.Future, index: int, triple: tuple[str, str, str]
+    ) -> dict[str, Any]:
+        """One request's brief out of a batch; re-submitted alone if the batch let it down."""
+        try:
+            analyses = await asyncio.shield(batch_task)
+        except Exception as e:
+            logger.warning("Batched LLM analysis failed (%s), analyzing requests individually", e)
+            analyses = []
+        if index < len(analyses) and analyses[index] is not None:
+            return analyses[index]
+        return await self._analyze_with_llm(*triple)
+
+    async def _analyze_with_llm_batch(
+        self, triples: list[tuple[str, str, str]]
+    ) -> list[dict[str, Any] | None]:
+        """
+        Analyze several requests in one completion. Returns the briefs in
+        input order, with None for any the response left out or malformed.
+        """
+        numbered = "\n\n".join(
+            f"{i}. User request: {prompt}\n"
+            f"   Preferred language: {language}\n"
+            f"   Target platform: {platform}"
+            for i, (prompt, language, platform) in enumerate(triples, 1)
+        )
+        max_tokens = min(3000 * len(triples), 16000)
+        # Non-streamed: the timeout covers the whole output, and a failed
+        # batch falls back to per-request analysis instead of SDK retries
+        response = await without_retries(self.llm_client).chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": (
+                    f"Analyze these {len(triples)} requests independently. Return a JSON "
+                    'object {"analyses": [...]} holding one analysis object per request, '
+                    f"in the same order.\n\n{numbered}"
+                )},
+            ],
+            temperature=0.3,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            timeout=completion_timeout(max_tokens),
+        )
+        analyses = jsonlib.loads(response.choices[0].message.content).get("analyses")
+        if not isinstance(analyses, list):
+            raise ValueError("batched analysis response has no 'analyses' array")
+        return [
+            analyses[i] if i < len(analyses) and self._is_analysis(analyses[i]) else None
+            for i in range(len(triples))
+        ]
+
+    @staticmethod
+    def _is_analysis(value: Any) -> bool:
+        return (
+            isinstance(value, dict)
+            and isinstance(value.get("tasks"), list)
+            and isinstance(value.get("functions_needed", []), list)
+        )
+
+    async def _analyze_with_llm(
+        self,
+        user_prompt: str,
+        language: str,
+        platform: str,
+        on_functions_needed: Callable[[list[dict[str, Any]]], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Use GPT to analyze the user request. The completion is streamed so
+        ``on_functions_needed`` can fire before the whole brief is done.
+        """
+        augmented_prompt = (
+            f"User request: {user_prompt}\n\n"
+            f"Preferred language: {language}\n"
+            f"Target platform: {platform}"
+        )
+        response = await self.llm_client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": augmented_prompt},
+            ],
+            temperature=0.3,
+            max_tokens=3000,
+            response_format={"type": "json_object"},
+            stream=True,
+        )
+        analysis: dict[str, Any] = {}
+        async for key, value in iter_json_members(iter_stream_text(response)):
+            analysis[key] = value
+            if key == "functions_needed" and on_functions_needed is not None:
+                on_functions_needed(value)
+        return analysis
 
     def _analyze_with_rules(self, user_prompt: str, language: str, platform: str) -> dict[str, Any]:
         """
@@ -191,14 +961,17 @@ class MetaOrchestrator:
         """
         prompt_lower = user_prompt.lower()
 
+        # One pass over the prompt finds every keyword from every table
+        hits = _KEYWORD_SCANNER.scan(prompt_lower)
+
         # Domain detection
-        domain = self._detect_domain(prompt_lower)
+        domain = self._detect_domain(hits)
 
         # Extract explicit data fields the user mentioned
-        user_slots = self._extract_user_slots(prompt_lower)
+        user_slots = self._extract_user_slots(hits)
 
         # Detect tasks
-        tasks = self._detect_tasks(prompt_lower, domain)
+        tasks = self._detect_tasks(hits, domain)
 
         # Merge user-mentioned slots into tasks
         if user_slots:
@@ -208,13 +981,13 @@ class MetaOrchestrator:
         functions_needed = self._detect_functions(tasks, prompt_lower)
 
         # Detect persona preferences
-        name, traits, style = self._detect_persona(prompt_lower, domain)
+        name, traits, style = self._detect_persona(hits, domain)
 
         # Build flow summary
         flow_summary = self._build_flow_summary(tasks)
 
         # Detect voice preferences
-        gender = self._detect_voice_gender(prompt_lower)
+        gender = self._detect_voice_gender(hits)
 
         return {
             "domain": domain,
@@ -232,55 +1005,15 @@ class MetaOrchestrator:
             "user_requested_slots": user_slots,
         }
 
-    def _detect_domain(self, text: str) -> str:
-        domain_keywords = {
-            "healthcare": ["appointment", "doctor", "clinic", "hospital", "patient", "medical", "health", "therapy"],
-            "e-commerce": ["order", "product", "shipping", "cart", "purchase", "delivery", "shop", "store", "buy"],
-            "finance": ["account", "balance", "transaction", "payment", "loan", "bank", "card", "credit"],
-            "travel": ["flight", "hotel", "booking", "reservation", "travel", "trip", "airline"],
-            "telecommunications": ["plan", "data", "mobile", "phone bill", "sim", "network", "roaming"],
-            "food_delivery": ["food", "restaurant", "delivery", "menu", "order food", "meal"],
-            "insurance": ["claim", "policy", "insurance", "coverage", "premium"],
-            "education": ["course", "class", "enrollment", "student", "tutor", "training"],
-            "real_estate": ["property", "rent", "lease", "apartment", "house", "real estate"],
-            "automotive": ["car", "vehicle", "service", "repair", "maintenance", "dealership"],
-        }
-        for domain, keywords in domain_keywords.items():
-            if any(kw in text for kw in keywords):
-                return domain
-        return "general_support"
+    def _detect_domain(self, hits: set[tuple[str, str]]) -> str:
+        return next((d for d in _DOMAIN_KEYWORDS if ("domain", d) in hits), "general_support")
 
-    def _extract_user_slots(self, text: str) -> list[str]:
+    def _extract_user_slots(self, hits: set[tuple[str, str]]) -> list[str]:
         """
         Scan the user's prompt for explicitly mentioned data fields.
         Returns a list of slot names the user wants to collect.
         """
-        slot_keywords = {
-            "customer_name": ["name", "first name", "last name", "full name", "caller name", "user name"],
-            "email": ["email", "e-mail", "email address", "mail"],
-            "phone_number": ["phone", "phone number", "mobile", "contact number", "cell"],
-            "preferred_date": ["date", "day", "when", "preferred date", "appointment date"],
-            "preferred_time": ["time", "preferred time", "appointment time", "what time"],
-            "address": ["address", "location", "where"],
-            "service_type": ["service", "service type", "type of service"],
-            "reason": ["reason", "purpose", "why"],
-            "order_number": ["order number", "order id", "order #"],
-            "account_number": ["account number", "account id", "account #"],
-            "issue_description": ["issue", "problem", "complaint", "describe"],
-            "age": ["age", "how old"],
-            "dob": ["date of birth", "dob", "birthday"],
-            "insurance_id": ["insurance", "insurance id", "policy number"],
-            "company_name": ["company", "organization", "business name"],
-        }
-
-        found_slots = []
-        for slot_name, keywords in slot_keywords.items():
-            for kw in keywords:
-                if kw in text:
-                    if slot_name not in found_slots:
-                        found_slots.append(slot_name)
-                    break
-        return found_slots
+        return [slot for slot in _SLOT_KEYWORDS if ("slot", slot) in hits]
 
     def _merge_user_slots_into_tasks(
         self, tasks: list[dict], user_slots: list[str]
@@ -322,166 +1055,26 @@ class MetaOrchestrator:
 
         return tasks
 
-    def _detect_tasks(self, text: str, domain: str) -> list[dict]:
-        tasks = []
-        task_patterns = {
-            "greet": {
-                "keywords": ["greet", "welcome", "hello", "introduce"],
-                "task_name": "Greeting",
-                "description": "Greet the caller and introduce the service",
-                "data_to_collect": [],
-                "requires_api": False,
-                "api_description": "",
-            },
-            "collect_name": {
-                "keywords": ["take name", "ask name", "collect name", "get name", "ask for name"],
-                "task_name": "Collect Customer Name",
-                "description": "Collect the caller's name for personalization",
-                "data_to_collect": ["customer_name"],
-                "requires_api": False,
-                "api_description": "",
-            },
-            "collect_email": {
-                "keywords": ["email", "e-mail", "mail address"],
-                "task_name": "Collect Email",
-                "description": "Collect the caller's email address",
-                "data_to_collect": ["email"],
-                "requires_api": False,
-                "api_description": "",
-            },
-            "collect_phone": {
-                "keywords": ["phone number", "mobile number", "contact number"],
-                "task_name": "Collect Phone Number",
-                "description": "Collect the caller's phone number",
-                "data_to_collect": ["phone_number"],
-                "requires_api": False,
-                "api_description": "",
-            },
-            "appointment": {
-                "keywords": ["appointment", "schedule", "book", "booking", "slot"],
-                "task_name": "Appointment Booking",
-                "description": "Book an appointment for the customer",
-                "data_to_collect": ["customer_name", "preferred_date", "preferred_time"],
-                "requires_api": True,
-                "api_description": "Check available appointment slots and book an appointment",
-            },
-            "order_status": {
-                "keywords": ["order status", "track order", "where is my order", "order tracking"],
-                "task_name": "Order Status Check",
-                "description": "Check the status of a customer's order",
-                "data_to_collect": ["order_number"],
-                "requires_api": True,
-                "api_description": "Look up order status by order number",
-            },
-            "account_inquiry": {
-                "keywords": ["account", "balance", "statement"],
-                "task_name": "Account Inquiry",
-                "description": "Look up customer account information",
-                "data_to_collect": ["account_number"],
-                "requires_api": True,
-                "api_description": "Retrieve account details and balance",
-            },
-            "complaint": {
-                "keywords": ["complaint", "issue", "problem", "wrong"],
-                "task_name": "File Complaint",
-                "description": "Record and process a customer complaint",
-                "data_to_collect": ["customer_name", "issue_description"],
-                "requires_api": True,
-                "api_description": "Submit a customer complaint ticket",
-            },
-            "cancel": {
-                "keywords": ["cancel", "cancellation", "refund"],
-                "task_name": "Cancellation Processing",
-                "description": "Process a cancellation or refund request",
-                "data_to_collect": ["order_number", "cancellation_reason"],
-                "requires_api": True,
-                "api_description": "Process cancellation and initiate refund",
-            },
-            "confirm": {
-                "keywords": ["confirm", "verify", "availability", "available"],
-                "task_name": "Confirm Availability",
-                "description": "Confirm availability via external system",
-                "data_to_collect": [],
-                "requires_api": True,
-                "api_description": "Verify availability through the backend API",
-            },
-            "faq": {
-                "keywords": ["faq", "question", "information", "info", "help"],
-                "task_name": "FAQ & Information",
-                "description": "Answer frequently asked questions",
-                "data_to_collect": [],
-                "requires_api": False,
-                "api_description": "",
-            },
-        }
-
-        # Detect greeting (always present)
-        if any(kw in text for kw in task_patterns["greet"]["keywords"]) or True:
-            greet = task_patterns["greet"].copy()
-            tasks.append(greet)
+    def _detect_tasks(self, hits: set[tuple[str, str]], domain: str) -> list[dict]:
+        # Keyed by task name: insertion order and dedup in a single pass.
+        # Greeting is always present.
+        greet = _TASK_PATTERNS["greet"]
+        tasks = {greet.task_name: greet.as_task(with_keywords=True)}
 
         # Detect other tasks
-        for key, pattern in task_patterns.items():
-            if key == "greet":
-                continue
-            if any(kw in text for kw in pattern["keywords"]):
-                task = pattern.copy()
-                task.pop("keywords", None)
-                tasks.append(task)
+        for key, pattern in _TASK_PATTERNS.items():
+            if key != "greet" and ("task", key) in hits and pattern.task_name not in tasks:
+                tasks[pattern.task_name] = pattern.as_task()
 
         # If only greeting detected, try domain-based defaults
         if len(tasks) <= 1:
-            domain_defaults = self._domain_default_tasks(domain)
-            tasks.extend(domain_defaults)
-
-        # Deduplicate tasks by name
-        seen_names = set()
-        unique_tasks = []
-        for t in tasks:
-            if t["task_name"] not in seen_names:
-                seen_names.add(t["task_name"])
-                unique_tasks.append(t)
-        return unique_tasks
+            for task in self._domain_default_tasks(domain):
+                tasks.setdefault(task["task_name"], task)
+
+        return list(tasks.values())
 
     def _domain_default_tasks(self, domain: str) -> list[dict]:
-        defaults = {
-            "healthcare": [
-                {
-                    "task_name": "Appointment Booking",
-                    "description": "Book an appointment for the customer",
-                    "data_to_collect": ["customer_name", "preferred_date", "preferred_time"],
-                    "requires_api": True,
-                    "api_description": "Check available appointment slots and book an appointment",
-                }
-            ],
-            "e-commerce": [
-                {
-                    "task_name": "Order Status Check",
-                    "description": "Check the status of a customer's order",
-                    "data_to_collect": ["order_number"],
-                    "requires_api": True,
-                    "api_description": "Look up order status by order number",
-                }
-            ],
-            "finance": [
-                {
-                    "task_name": "Account Inquiry",
-                    "description": "Look up customer account information",
-                    "data_to_collect": ["account_number"],
-                    "requires_api": True,
-                    "api_description": "Retrieve account details and balance",
-                }
-            ],
-        }
-        return defaults.get(domain, [
-            {
-                "task_name": "General Inquiry",
-                "description": "Handle general customer inquiries",
-                "data_to_collect": ["customer_name", "inquiry_details"],
-                "requires_api": False,
-                "api_description": "",
-            }
-        ])
+        return [_DOMAIN_DEFAULT_TASKS.get(domain, _GENERAL_INQUIRY_TASK).as_task()]
 
     def _detect_functions(self, tasks: list[dict], text: str) -> list[dict]:
         functions = []
@@ -489,7 +1082,8 @@ class MetaOrchestrator:
             if not task.get("requires_api"):
                 continue
 
-            task_name = task["task_name"].lower().replace(" ", "_")
+            task_name = task["task_name"]
+            task_name = _TASK_KEYS.get(task_name) or task_name.lower().replace(" ", "_")
             fn_name = self._task_to_function_name(task_name, task)
             fn_params = self._task_to_function_params(task, text)
 
@@ -503,74 +1097,34 @@ class MetaOrchestrator:
         return functions
 
     def _task_to_function_name(self, task_name: str, task: dict) -> str:
-        name_map = {
-            "appointment_booking": "get_appointment_slots",
-            "order_status_check": "get_order_status",
-            "account_inquiry": "get_account_info",
-            "file_complaint": "submit_complaint",
-            "cancellation_processing": "process_cancellation",
-            "confirm_availability": "check_availability",
-            "general_inquiry": "search_knowledge_base",
-        }
-        fn_name = name_map.get(task_name)
+        fn_name = _TASK_FUNCTION_NAMES.get(task_name)
         if fn_name:
             return fn_name
 
         # Generate from task name
-        clean = re.sub(r"[^a-z0-9_]", "", task_name)
+        clean = _NAME_SANITIZER.sub("", task_name)
         return clean if clean else "perform_action"
 
     def _task_to_function_params(self, task: dict, text: str) -> list[dict]:
-        params = []
-        for slot in task.get("data_to_collect", []):
-            param_type = "string"
-            if "date" in slot.lower():
-                param_type = "string"  # ISO date string
-            elif "number" in slot.lower() or "amount" in slot.lower():
-                param_type = "string"
-            elif "count" in slot.lower() or "quantity" in slot.lower():
-                param_type = "integer"
-
-            params.append({
+        return [
+            {
                 "name": slot,
-                "type": param_type,
+                "type": _slot_param_type(slot),
                 "description": f"The customer's {slot.replace('_', ' ')}",
-            })
-        return params
+            }
+            for slot in task.get("data_to_collect", [])
+        ]
 
     def _infer_output(self, fn_name: str, task: dict) -> str:
-        output_map = {
-            "get_appointment_slots": "List of available appointment slots with dates and times",
-            "book_appointment": "Booking confirmation with confirmation code",
-            "get_order_status": "Order status including tracking info and estimated delivery",
-            "get_account_info": "Account details including balance and recent activity",
-            "submit_complaint": "Complaint ticket ID and status",
-            "process_cancellation": "Cancellation confirmation and refund details",
-            "check_availability": "Availability status with available options",
-            "search_knowledge_base": "Relevant FAQ entries or knowledge base articles",
-        }
-        return output_map.get(fn_name, "JSON response with operation result")
-
-    def _detect_persona(self, text: str, domain: str) -> tuple[str, list[str], str]:
-        domain_names = {
-            "healthcare": "MediBot",
-            "e-commerce": "ShopAssist",
-            "finance": "FinanceHelper",
-            "travel": "TravelBuddy",
-            "telecommunications": "TeleConnect",
-            "food_delivery": "FoodieBot",
-            "insurance": "InsureGuide",
-            "education": "EduAssist",
-            "real_estate": "PropertyPal",
-            "automotive": "AutoCare",
-            "general_support": "Ava",
-        }
-        name = domain_names.get(domain, "Ava")
+        return _FUNCTION_OUTPUTS.get(fn_name, "JSON response with operation result")
 
-        if "formal" in text:
+    def _detect_persona(self, hits: set[tuple[str, str]], domain: str) -> tuple[str, list[str], str]:
+        name = _DOMAIN_AGENT_NAMES.get(domain, "Ava")
+
+        if ("style", "formal") in hits:
             style = "formal"
             traits = ["professional", "courteous", "precise"]
-        elif "casual" in text or "friendly" in text:
+        elif ("style", "casual") in hits:
             style = "casual"
             traits = ["friendly", "upbeat", "approachable"]
         else:
@@ -579,55 +1133,31 @@ class MetaOrchestrator:
 
         return name, traits, style
 
-    def _detect_voice_gender(self, text: str) -> str:
-        if "male voice" in text or "male agent" in text:
+    def _detect_voice_gender(self, hits: set[tuple[str, str]]) -> str:
+        # "female voice" contains "male voice", so a male hit wins either way
+        if ("voice", "male") in hits:
             return "male"
-        if "female voice" in text or "female agent" in text:
-            return "female"
         return "female"
 
     def _role_for_domain(self, domain: str) -> str:
-        roles = {
-            "healthcare": "Appointment & Patient Support Agent",
-            "e-commerce": "Order & Shopping Support Agent",
-            "finance": "Account & Financial Support Agent",
-            "travel": "Booking & Travel Support Agent",
-            "telecommunications": "Service & Billing Support Agent",
-            "food_delivery": "Order & Delivery Support Agent",
-            "insurance": "Claims & Policy Support Agent",
-            "education": "Enrollment & Course Support Agent",
-            "real_estate": "Property & Leasing Support Agent",
-            "automotive": "Service & Repair Support Agent",
-            "general_support": "Customer Support Agent",
-        }
-        return roles.get(domain, "Customer Support Agent")
+        return _DOMAIN_ROLES.get(domain, "Customer Support Agent")
 
     def _build_flow_summary(self, tasks: list[dict]) -> list[str]:
-        steps = ["Step 1: Greet the caller and introduce the service"]
-        step_num = 2
-
+        # Step texts first, numbered in one pass at the end
+        bodies = ["Greet the caller and introduce the service"]
         for task in tasks:
             if task["task_name"] == "Greeting":
                 continue
-            slots = task.get("data_to_collect", [])
-            for slot in slots:
-                steps.append(
-                    f"Step {step_num}: Ask for the customer's {slot.replace('_', ' ')}"
-                )
-                step_num += 1
+            bodies.extend(
+                _ASK_FOR_SLOT.get(slot) or _ask_for_slot(slot)
+                for slot in task.get("data_to_collect", [])
+            )
             if task.get("requires_api"):
-                steps.append(
-                    f"Step {step_num}: {task.get('api_description', 'Call external API')}"
-                )
-                step_num += 1
-                steps.append(
-                    f"Step {step_num}: Communicate the result to the caller"
-                )
-                step_num += 1
-
-        steps.append(f"Step {step_num}: Ask if there's anything else")
-        steps.append(f"Step {step_num + 1}: End the call politely")
-        return steps
+                bodies.append(task.get("api_description", "Call external API"))
+                bodies.append("Communicate the result to the caller")
+        bodies.append("Ask if there's anything else")
+        bodies.append("End the call politely")
+        return [f"Step {i}: {body}" for i, body in enumerate(bodies, 1)]
 
     # ────────────────── Step 4: Merge Config ──────────────────
 
@@ -638,120 +1168,189 @@ class MetaOrchestrator:
         functions: list[dict[str, Any]],
         platform: str,
     ) -> CXAgentConfig:
-        """Merge sub-agent outputs into a single CXAgentConfig."""
+        """
+        Merge sub-agent outputs into a single CXAgentConfig.
+
+        In LLM mode the validated persona / voice / intents / functions /
+        flow models are cached by a digest of the raw sub-agent outputs, so
+        re-merging the same outputs (a platform sweep, a repeated cached
+        generation) only builds the top-level config around the
+        already-validated parts. Rule-mode outputs are never re-merged, so
+        that path skips the key entirely.
+        """
+        key = self._merged_parts_key(agent_config, functions) if self.llm_client else None
+
+        parts = self._merged_parts_cache.get(key) if key is not None else None
+        if parts is not None:
+            self._merged_parts_cache.move_to_end(key)
+            parts = self._with_fresh_ids(parts)
+        else:
+            parts = self._config_parts(agent_config, functions)
+
+        config = CXAgentConfig.model_validate({
+            **parts,
+            "deployment": {"platform": platform},
+            "metadata": {
+                "source_prompt": analysis.get("domain", ""),
+                "generation_mode": "llm" if self.llm_client else "rule_based",
+            },
+        })
+
+        if key is not None and key not in self._merged_parts_cache:
+            # Everything below the top level is frozen with tuple containers,
+            # so only the part lists and the functions' dicts need copying
+            self._merged_parts_cache[key] = {
+                **{name: getattr(config, name) for name in _CONFIG_PARTS},
+                "intents": tuple(config.intents),
+                "functions": tuple(self._own_function(f) for f in config.functions),
+            }
+            while len(self._merged_parts_cache) > self.merged_parts_cache_max_entries:
+                self._merged_parts_cache.popitem(last=False)
+        return config
+
+    @staticmethod
+    def _merged_parts_key(agent_config: dict[str, Any], functions: list[dict[str, Any]]) -> bytes | None:
+        try:
+            encoded = jsonlib.dumpb([agent_config, functions], sort_keys=True)
+        except TypeError:  # not JSON-serializable, so not cacheable
+            return None
+        return hashlib.blake2b(encoded, digest_size=16).digest()
+
+    @classmethod
+    def _with_fresh_ids(cls, parts: dict[str, Any]) -> dict[str, Any]:
+        """Copies of cached parts with new generated IDs, so no two agents share one."""
+        flow = parts["conversation_flow"]
+        return {
+            **parts,
+            "intents": [i.model_copy(update={"intent_id": _short_id("intent")}) for i in parts["intents"]],
+            "functions": [cls._own_function(f, function_id=_short_id("fn")) for f in parts["functions"]],
+            "conversation_flow": flow.model_copy(update={"flow_id": _short_id("flow")}) if flow else None,
+        }
+
+    @staticmethod
+    def _own_function(fn: FunctionDefinition, **update: Any) -> FunctionDefinition:
+        """Copy of ``fn`` with private copies of its dict-valued (JSON) fields."""
+        if fn.api_endpoint is not None:
+            update["api_endpoint"] = replace(fn.api_endpoint, headers=dict(fn.api_endpoint.headers))
+        if fn.mock_response is not None:
+            update["mock_response"] = _json_copy(fn.mock_response)
+        if any(isinstance(p.default, (dict, list)) for p in fn.parameters):
+            update["parameters"] = tuple(
+                replace(p, default=_json_copy(p.default)) if isinstance(p.default, (dict, list)) else p
+                for p in fn.parameters
+            )
+        return fn.model_copy(update=update)
+
+    def _config_parts(self, agent_config: dict[str, Any], functions: list[dict[str, Any]]) -> dict[str, Any]:
+        """Raw field dicts for the sub-agent-generated parts of a CXAgentConfig."""
+
+        # The config is assembled as plain dicts and validated in a single
+        # CXAgentConfig.model_validate call: one pass through pydantic-core
+        # instead of a Python-level constructor call per nested model.
 
-        # Build PersonaConfig
+        # PersonaConfig
         persona_raw = agent_config.get("persona", {})
-        persona = PersonaConfig(
-            name=persona_raw.get("name", "Ava"),
-            role=persona_raw.get("role", "Customer Support Agent"),
-            personality_traits=persona_raw.get("personality_traits", ["friendly"]),
-            greeting_style=persona_raw.get("greeting_style", "warm"),
-            system_prompt=persona_raw.get("system_prompt", "You are a helpful agent."),
-            fallback_message=persona_raw.get("fallback_message", "I didn't catch that."),
-            escalation_message=persona_raw.get("escalation_message", "Let me transfer you."),
-            max_retries=persona_raw.get("max_retries", 3),
-        )
+        persona = {
+            "name": persona_raw.get("name", "Ava"),
+            "role": persona_raw.get("role", "Customer Support Agent"),
+            "personality_traits": persona_raw.get("personality_traits", ["friendly"]),
+            "greeting_style": persona_raw.get("greeting_style", "warm"),
+            "system_prompt": persona_raw.get("system_prompt", "You are a helpful agent."),
+            "fallback_message": persona_raw.get("fallback_message", "I didn't catch that."),
+            "escalation_message": persona_raw.get("escalation_message", "Let me transfer you."),
+            "max_retries": persona_raw.get("max_retries", 3),
+        }
 
-        # Build VoiceConfig
+        # VoiceConfig
         voice_raw = agent_config.get("voice", {})
-        voice = VoiceConfig(
-            provider=voice_raw.get("provider", "google"),
-            voice_id=voice_raw.get("voice_id", "en-US-Neural2-F"),
-            gender=voice_raw.get("gender", "female"),
-            language=voice_raw.get("language", "en-US"),
-            speaking_rate=voice_raw.get("speaking_rate", 1.0),
-            pitch=voice_raw.get("pitch", 0.0),
-        )
+        voice = {
+            "provider": voice_raw.get("provider", "google"),
+            "voice_id": voice_raw.get("voice_id", "en-US-Neural2-F"),
+            "gender": voice_raw.get("gender", "female"),
+            "language": voice_raw.get("language", "en-US"),
+            "speaking_rate": voice_raw.get("speaking_rate", 1.0),
+            "pitch": voice_raw.get("pitch", 0.0),
+        }
 
-        # Build IntentDefinitions
-        intents = []
-        for intent_raw in agent_config.get("intents", []):
-            phrases = [
-                TrainingPhrase(text=p["text"], language=p.get("language", "en-US"))
-                for p in intent_raw.get("training_phrases", [])
-            ]
-            intents.append(IntentDefinition(
-                name=intent_raw["name"],
-                description=intent_raw.get("description", ""),
-                training_phrases=phrases,
-                priority=intent_raw.get("priority", 0),
-            ))
+        # IntentDefinitions and FunctionDefinitions are handed over as
+        # generators: pydantic consumes them item by item, so the raw dicts
+        # for a large agent are never all materialized alongside the models
+        intents = (
+            {
+                "name": intent_raw["name"],
+                "description": intent_raw.get("description", ""),
+                "training_phrases": (
+                    {"text": p["text"], "language": p.get("language", "en-US")}
+                    for p in intent_raw.get("training_phrases", [])
+                ),
+                "priority": intent_raw.get("priority", 0),
+            }
+            for intent_raw in agent_config.get("intents", [])
+        )
 
-        # Build FunctionDefinitions
-        func_defs = []
-        for fn_raw in functions:
-            params = [
-                FunctionParameter(
-                    name=p["name"],
-                    type=p.get("type", "string"),
-                    description=p.get("description", ""),
-                    required=p.get("required", True),
-                    default=p.get("default"),
-                    enum=p.get("enum"),
-                )
-                for p in fn_raw.get("parameters", [])
-            ]
-            endpoint = None
-            if fn_raw.get("api_endpoint"):
-                ep = fn_raw["api_endpoint"]
-                endpoint = APIEndpoint(
-                    url=ep.get("url", "/api/v1/action"),
-                    method=ep.get("method", "POST"),
-                    headers=ep.get("headers", {"Content-Type": "application/json"}),
-                    auth_type=ep.get("auth_type"),
-                    timeout_seconds=ep.get("timeout_seconds", 10),
-                )
-            func_defs.append(FunctionDefinition(
-                name=fn_raw["name"],
-                description=fn_raw.get("description", ""),
-                parameters=params,
-                returns_description=fn_raw.get("returns_description", ""),
-                api_endpoint=endpoint,
-                mock_response=fn_raw.get("mock_response"),
-            ))
+        func_defs = (self._function_fields(fn_raw) for fn_raw in functions)
 
-        # Build ConversationFlow
+        # ConversationFlow
         flow_raw = agent_config.get("conversation_flow")
         flow = None
         if flow_raw:
-            flow_nodes = []
-            for n in flow_raw.get("nodes", []):
-                transitions = [
-                    FlowTransition(
-                        condition=t["condition"],
-                        target_node_id=t["target_node_id"],
-                    )
-                    for t in n.get("transitions", [])
-                ]
-                flow_nodes.append(FlowNode(
-                    node_id=n["node_id"],
-                    type=n.get("type", "response"),
-                    label=n.get("label", ""),
-                    prompt_text=n.get("prompt_text"),
-                    collect_slot=n.get("collect_slot"),
-                    function_call=n.get("function_call"),
-                    transitions=transitions,
-                ))
-            flow = ConversationFlow(
-                name=flow_raw.get("name", "main_flow"),
-                description=flow_raw.get("description", ""),
-                entry_node_id=flow_raw.get("entry_node_id", "node_greet"),
-                nodes=flow_nodes,
-            )
+            flow = {
+                "name": flow_raw.get("name", "main_flow"),
+                "description": flow_raw.get("description", ""),
+                "entry_node_id": flow_raw.get("entry_node_id", "node_greet"),
+                # Nodes that already carry every field (the Agent Creator's
+                # always do) go to pydantic-core as-is, unknown keys ignored
+                "nodes": (
+                    n if _FLOW_NODE_FIELDS <= n.keys() else {
+                        "node_id": n["node_id"],
+                        "type": n.get("type", "response"),
+                        "label": n.get("label", ""),
+                        "prompt_text": n.get("prompt_text"),
+                        "collect_slot": n.get("collect_slot"),
+                        "function_call": n.get("function_call"),
+                        # Transitions have no defaults to fill: validated as-is
+                        "transitions": n.get("transitions", ()),
+                    }
+                    for n in flow_raw.get("nodes", [])
+                ),
+            }
 
-        # Build DeploymentConfig
-        deployment = DeploymentConfig(platform=platform)
-
-        return CXAgentConfig(
-            persona=persona,
-            voice=voice,
-            intents=intents,
-            functions=func_defs,
-            conversation_flow=flow,
-            deployment=deployment,
-            metadata={
-                "source_prompt": analysis.get("domain", ""),
-                "generation_mode": "llm" if self.llm_client else "rule_based",
-            },
-        )
+        return {
+            "persona": persona,
+            "voice": voice,
+            "intents": intents,
+            "functions": func_defs,
+            "conversation_flow": flow,
+        }
+
+    @staticmethod
+    def _function_fields(fn_raw: dict[str, Any]) -> dict[str, Any]:
+        """FunctionDefinition fields for one Function Creator output."""
+        endpoint = None
+        if fn_raw.get("api_endpoint"):
+            ep = fn_raw["api_endpoint"]
+            endpoint = {
+                "url": ep.get("url", "/api/v1/action"),
+                "method": ep.get("method", "POST"),
+                "headers": ep.get("headers", {"Content-Type": "application/json"}),
+                "auth_type": ep.get("auth_type"),
+                "timeout_seconds": ep.get("timeout_seconds", 10),
+            }
+        return {
+            "name": fn_raw["name"],
+            "description": fn_raw.get("description", ""),
+            "parameters": (
+                {
+                    "name": p["name"],
+                    "type": p.get("type", "string"),
+                    "description": p.get("description", ""),
+                    "required": p.get("required", True),
+                    "default": p.get("default"),
+                    "enum": p.get("enum"),
+                }
+                for p in fn_raw.get("parameters", [])
+            ),
+            "returns_description": fn_raw.get("returns_description", ""),
+            "api_endpoint": endpoint,
+            "mock_response": fn_raw.get("mock_response"),
+        }
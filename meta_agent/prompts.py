@@ -169,6 +169,18 @@ RETURN ONLY THE JSON. No other text.
 """
 
 
+AGENT_CREATOR_BATCH_PROMPT = """\
+## Batch Mode
+The user message contains several analysis briefs as {"briefs": [<brief1>, <brief2>, ...]}. \
+Produce one complete agent configuration per brief, following every rule above, and return:
+{"results": [<config for brief1>, <config for brief2>, ...]}
+
+The "results" array must have exactly one entry per brief, in the same order.
+
+RETURN ONLY THE JSON. No other text.
+"""
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  FUNCTION CREATOR SUB-AGENT PROMPT
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
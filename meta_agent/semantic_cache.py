@@ -0,0 +1,174 @@
+"""
+Approximate-match cache for LLM-generated agent configurations.
+
+The exact-hash cache in the Agent Creator only helps when a brief repeats
+byte-for-byte. LLM-produced analyses of the same request rarely do: the
+wording of descriptions, traits, or the suggested name drifts between
+runs. This cache reuses a previous configuration when a new brief is
+*structurally* identical (same domain, language, voice, tasks, slots and
+functions) and its free text is similar by MinHash Jaccard estimate.
+
+On a hit the cached config is copied and whole-word occurrences of the
+old agent name / role are swapped for the new ones, so the caller gets a sub-millisecond
+answer instead of a multi-second chat completion.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import random
+import re
+from collections import OrderedDict
+from typing import Any
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class MinHash:
+    """Fixed-size MinHash signatures over token sets (pure Python)."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, tokens: set[str]) -> tuple[int, ...]:
+        if not tokens:
+            return (0,) * self.num_perm
+        hashes = [
+            int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "big")
+            for t in tokens
+        ]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of the two underlying token sets."""
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class SemanticCache:
+    """
+    Bounded LRU of ``(structure, MinHash signature) → config`` entries.
+
+    Args:
+        threshold:   Minimum estimated Jaccard similarity for a hit.
+        max_entries: Oldest entries are evicted beyond this size.
+    """
+
+    def __init__(self, threshold: float = 0.85, max_entries: int = 256, num_perm: int = 64):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._minhash = MinHash(num_perm=num_perm)
+        # key → (structure, signature, analysis name/role, config)
+        self._entries: OrderedDict[int, tuple[tuple, tuple[int, ...], tuple[str, str], dict]] = OrderedDict()
+        self._next_key = 0
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, analysis: dict[str, Any]) -> dict[str, Any] | None:
+        """Return a patched copy of a similar cached config, or None."""
+        structure = self._structure(analysis)
+        signature = self._minhash.signature(self._tokens(analysis))
+
+        best_key, best_sim = None, self.threshold
+        for key, (cached_structure, cached_sig, _, _) in self._entries.items():
+            if cached_structure != structure:
+                continue
+            sim = MinHash.similarity(signature, cached_sig)
+            if sim >= best_sim:
+                best_key, best_sim = key, sim
+
+        if best_key is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        self._entries.move_to_end(best_key)
+        _, _, (old_name, old_role), config = self._entries[best_key]
+        new_name, new_role = self._identity(analysis)
+        replacements = [
+            (_whole_word(old), new)
+            for old, new in ((old_name, new_name), (old_role, new_role))
+            if old and old != new
+        ]
+        # _replace_strings rebuilds every container, so this is a fresh copy
+        return _replace_strings(config, replacements)
+
+    def put(self, analysis: dict[str, Any], config: dict[str, Any]) -> None:
+        """Remember ``config`` as the answer for ``analysis``."""
+        self._entries[self._next_key] = (
+            self._structure(analysis),
+            self._minhash.signature(self._tokens(analysis)),
+            self._identity(analysis),
+            copy.deepcopy(config),
+        )
+        self._next_key += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # ── Fingerprinting ──
+
+    @staticmethod
+    def _structure(analysis: dict[str, Any]) -> tuple:
+        """Fields that must match exactly for a config to be reusable."""
+        return (
+            analysis.get("domain"),
+            analysis.get("language"),
+            analysis.get("voice_gender"),
+            analysis.get("greeting_style"),
+            tuple(
+                (
+                    t.get("task_name"),
+                    tuple(t.get("data_to_collect", [])),
+                    bool(t.get("requires_api")),
+                )
+                for t in analysis.get("tasks", [])
+            ),
+            tuple(f.get("name") for f in analysis.get("functions_needed", [])),
+        )
+
+    @staticmethod
+    def _tokens(analysis: dict[str, Any]) -> set[str]:
+        """Free-text tokens whose wording may drift between analyses."""
+        parts = [analysis.get("agent_role", ""), " ".join(analysis.get("personality_traits", []))]
+        for t in analysis.get("tasks", []):
+            parts.append(t.get("description", ""))
+            parts.append(t.get("api_description", ""))
+        for f in analysis.get("functions_needed", []):
+            parts.append(f.get("purpose", ""))
+            parts.append(f.get("expected_output", ""))
+        return set(_TOKEN_RE.findall(" ".join(parts).lower()))
+
+    @staticmethod
+    def _identity(analysis: dict[str, Any]) -> tuple[str, str]:
+        return (
+            analysis.get("agent_name_suggestion", ""),
+            analysis.get("agent_role", ""),
+        )
+
+
+def _whole_word(text: str) -> re.Pattern[str]:
+    """Pattern matching ``text`` only where it is not part of a longer word."""
+    return re.compile(rf"(?<!\w){re.escape(text)}(?!\w)")
+
+
+def _replace_strings(value: Any, replacements: list[tuple[re.Pattern[str], str]]) -> Any:
+    """Apply ``(pattern, replacement)`` pairs to every string inside a JSON-like value."""
+    if isinstance(value, str):
+        for pattern, new in replacements:
+            # A function replacement keeps backslashes in ``new`` literal
+            value = pattern.sub(lambda _: new, value)
+        return value
+    if isinstance(value, dict):
+        return {k: _replace_strings(v, replacements) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_replace_strings(v, replacements) for v in value]
+    return value
@@ -0,0 +1,183 @@
+"""
+Incremental JSON parsing for streamed LLM responses.
+
+GPT-4o streams its JSON output a few characters at a time. Rather than
+waiting for the closing brace and parsing the whole
+body, the parser here emits each top-level member of the response object
+(``"persona": {...}``, ``"voice": {...}``, ...) as soon as it is complete,
+so callers can start working on early sections while later ones are still
+being generated. ``IncrementalJSONArrayItemParser`` does the same one level
+down, for responses shaped like ``{"functions": [{...}, {...}]}``.
+
+The scanner tracks nesting depth and string state character by character,
+so every byte is examined once — no re-parsing of the growing buffer.
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator
+
+from . import jsonlib
+
+
+class IncrementalJSONObjectParser:
+    """
+    Feed chunks of a JSON object; get back its completed top-level members.
+
+    Example:
+        parser = IncrementalJSONObjectParser()
+        parser.feed('{"a": 1, "b": {"c"')   # → [("a", 1)]
+        parser.feed(': 2}}')                # → [("b", {"c": 2})]
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0              # next character to scan
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start: int | None = None
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Consume a chunk and return any top-level members it completed."""
+        if self.done or not chunk:
+            return []
+
+        self._text += chunk
+        text = self._text
+        members: list[tuple[str, Any]] = []
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c == "{" or c == "[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = i + 1
+            elif c == "}" or c == "]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(text[self._member_start:i], members)
+                    self.done = True
+                    break
+            elif c == "," and self._depth == 1:
+                self._emit(text[self._member_start:i], members)
+                self._member_start = i + 1
+
+        # Drop consumed text so the buffer only holds the open member
+        start = self._member_start or 0
+        if self.done:
+            self._text, self._pos = "", 0
+        else:
+            self._text = text[start:]
+            self._pos = len(text) - start
+            self._member_start = 0 if self._member_start is not None else None
+        return members
+
+    @staticmethod
+    def _emit(member_text: str, out: list[tuple[str, Any]]) -> None:
+        if not member_text.strip():
+            return
+        out.extend(jsonlib.loads("{" + member_text + "}").items())
+
+
+class IncrementalJSONArrayItemParser:
+    """
+    Feed chunks of a ``{"key": [item, ...]}`` object; get back each array
+    item as soon as it closes. Items must be objects or arrays.
+
+    Example:
+        parser = IncrementalJSONArrayItemParser()
+        parser.feed('{"functions": [{"name": "a"}, {"na')   # → [{"name": "a"}]
+        parser.feed('me": "b"}]}')                         # → [{"name": "b"}]
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start: int | None = None
+        self.done = False
+
+    def feed(self, chunk: str) -> list[Any]:
+        """Consume a chunk and return any array items it completed."""
+        if self.done or not chunk:
+            return []
+
+        self._text += chunk
+        text = self._text
+        items: list[Any] = []
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c == "{" or c == "[":
+                self._depth += 1
+                if self._depth == 3:
+                    self._item_start = i
+            elif c == "}" or c == "]":
+                self._depth -= 1
+                if self._depth == 2:
+                    items.append(jsonlib.loads(text[self._item_start:i + 1]))
+                    self._item_start = None
+                elif self._depth == 0:
+                    self.done = True
+                    break
+
+        # Keep only the item still being generated
+        if self.done or self._item_start is None:
+            self._text, self._pos = "", 0
+        else:
+            self._text = text[self._item_start:]
+            self._pos = len(text) - self._item_start
+            self._item_start = 0
+        return items
+
+
+async def iter_stream_text(response: Any) -> AsyncIterator[str]:
+    """Yield the content deltas of an OpenAI ``stream=True`` chat completion."""
+    async for chunk in response:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
+async def iter_json_members(chunks: AsyncIterator[str]) -> AsyncIterator[tuple[str, Any]]:
+    """Parse a streamed JSON object, yielding ``(key, value)`` per member."""
+    parser = IncrementalJSONObjectParser()
+    async for chunk in chunks:
+        for member in parser.feed(chunk):
+            yield member
+    if not parser.done:
+        raise ValueError("Streamed JSON object ended before its closing brace")
+
+
+async def iter_json_array_items(chunks: AsyncIterator[str]) -> AsyncIterator[Any]:
+    """Parse a streamed ``{"key": [...]}`` object, yielding each array item."""
+    parser = IncrementalJSONArrayItemParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    if not parser.done:
+        raise ValueError("Streamed JSON object ended before its closing brace")
@@ -53,7 +53,7 @@ async function handleCreate() {
   setLoading(true);
 
   try {
-    const response = await fetch('/api/create-agent', {
+    const response = await fetch('/api/create-agent/sync', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify({
@@ -1,30 +1,35 @@
 """Quick test to verify the orchestrator properly extracts user-mentioned data slots."""
-import asyncio
+import sys
+
 from meta_agent.orchestrator import MetaOrchestrator
 
 
-async def test():
+def test():
     orch = MetaOrchestrator()
     analysis = orch._analyze_with_rules(
         "create a support bot for appointment booking take name email and greet that users",
         "en-US",
         "voiceowl"
     )
-    print("=== User Requested Slots ===")
-    print(analysis.get("user_requested_slots", []))
-    print()
-    print("=== Tasks ===")
+    # Collect the report and write it once instead of one print per line
+    lines = ["=== User Requested Slots ==="]
+    lines.append(str(analysis.get("user_requested_slots", [])))
+    lines.append("")
+    lines.append("=== Tasks ===")
     for t in analysis["tasks"]:
-        print(f"  {t['task_name']}: collect={t.get('data_to_collect', [])}")
-    print()
-    print("=== Functions ===")
+        lines.append(f"  {t['task_name']}: collect={t.get('data_to_collect', [])}")
+    lines.append("")
+    lines.append("=== Functions ===")
     for f in analysis["functions_needed"]:
         params = [p["name"] for p in f.get("input_params", [])]
-        print(f"  {f['name']}: params={params}")
-    print()
-    print("=== Flow Summary ===")
+        lines.append(f"  {f['name']}: params={params}")
+    lines.append("")
+    lines.append("=== Flow Summary ===")
     for step in analysis["flow_summary"]:
-        print(f"  {step}")
+        lines.append(f"  {step}")
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
 
 
-asyncio.run(test())
+test()
@@ -0,0 +1,47 @@
+"""Regression tests: a semantic cache hit must only swap whole-word names and roles."""
+from meta_agent.semantic_cache import SemanticCache
+
+ANALYSIS = {
+    "domain": "healthcare",
+    "language": "en-US",
+    "agent_name_suggestion": "Ava",
+    "agent_role": "scheduling assistant",
+    "personality_traits": ["friendly", "patient"],
+    "tasks": [{"task_name": "book_appointment", "description": "Book an appointment"}],
+}
+
+
+def _make_config() -> dict:
+    return {
+        "persona": {
+            "name": "Ava",
+            "role": "scheduling assistant",
+            "greeting": "Hi, I'm Ava. Available slots are listed below.",
+        },
+        "notes": ["Ava's calendar", "Unavailable: Savannah"],
+    }
+
+
+def _hit_for_max(config: dict) -> dict:
+    cache = SemanticCache()
+    cache.put(ANALYSIS, config)
+    hit = cache.get({**ANALYSIS, "agent_name_suggestion": "Max"})
+    assert hit is not None, "expected a semantic cache hit"
+    return hit
+
+
+def test_hit_replaces_name():
+    hit = _hit_for_max(_make_config())
+    assert hit["persona"]["name"] == "Max"
+
+
+def test_hit_replaces_only_whole_words():
+    hit = _hit_for_max(_make_config())
+    assert hit["persona"]["greeting"] == "Hi, I'm Max. Available slots are listed below."
+    assert hit["notes"] == ["Max's calendar", "Unavailable: Savannah"]
+
+
+def test_hit_leaves_cached_config_unchanged():
+    config = _make_config()
+    _hit_for_max(config)
+    assert config == _make_config()